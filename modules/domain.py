@@ -6,12 +6,15 @@ from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Any, Literal
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PartFeatures:
     """
     Detected features from CAD part analysis.
     All measurements in mm, volumes in mm³.
     Defaults to zero for all features.
+
+    Instances are immutable and slotted (no per-instance __dict__), so they
+    are cheap to allocate and hashable.
     """
 
     # Bounding box dimensions (mm)
@@ -49,7 +52,7 @@ class PartFeatures:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureConfidence:
     """
     Confidence scores for detected features.
@@ -72,7 +75,7 @@ class FeatureConfidence:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DfmIssue:
     """
     Design for Manufacturing issue detected in part.
@@ -96,7 +99,7 @@ class DfmIssue:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class QuoteResult:
     """
     Calculated quote result from pricing engine.
@@ -120,7 +123,7 @@ class QuoteResult:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """
     Complete result of processing a STEP file.
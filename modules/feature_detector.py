@@ -3,12 +3,13 @@ Feature detection utilities for Tiento Quote v0.1.
 
 Detects geometric features from STEP files for pricing calculations.
 """
-from typing import Tuple, List, Dict
-import cadquery as cq
-from modules.cad_io import load_step
+from typing import TYPE_CHECKING, Tuple, List, Dict
 from modules.domain import PartFeatures, FeatureConfidence
 from modules.settings import Settings
 
+if TYPE_CHECKING:
+    import cadquery as cq
+
 
 class BoundingBoxLimitError(Exception):
     """Raised when part exceeds maximum bounding box dimensions."""
@@ -478,53 +479,60 @@ def _is_pocket_face(face, solid_bbox) -> bool:
         return False
 
 
-def _faces_share_edge(face_a, face_b) -> bool:
+# Max distance (mm) between edge centers for two edges to count as shared
+EDGE_MATCH_TOLERANCE = 0.01
+
+
+def _edge_centers(face) -> List[Tuple[float, float, float]]:
     """
-    Check if two faces share at least one edge (topological connectivity).
+    Get the center point of every edge of a face.
+
+    Edges whose center cannot be computed are skipped.
 
     Args:
-        face_a: First face
-        face_b: Second face
+        face: Face to inspect
 
     Returns:
-        True if faces share an edge (are topologically connected)
+        List of (x, y, z) edge centers
     """
+    centers = []
+
     try:
-        # Get edges from both faces
-        edges_a = face_a.Edges()
-        edges_b = face_b.Edges()
-
-        # Check if any edge from face_a matches any edge from face_b
-        # Compare using edge center points (simpler and more reliable)
-        tolerance = 0.01  # mm tolerance for geometric comparison
-
-        for edge_a in edges_a:
-            # Get center point of edge_a
-            try:
-                center_a = edge_a.Center()
-                ax, ay, az = center_a.x, center_a.y, center_a.z
-            except:
-                continue
+        edges = face.Edges()
+    except Exception:
+        return centers
 
-            for edge_b in edges_b:
-                # Get center point of edge_b
-                try:
-                    center_b = edge_b.Center()
-                    bx, by, bz = center_b.x, center_b.y, center_b.z
-                except:
-                    continue
+    for edge in edges:
+        try:
+            center = edge.Center()
+            centers.append((center.x, center.y, center.z))
+        except Exception:
+            continue
 
-                # Calculate distance between edge centers
-                dist = ((ax - bx)**2 + (ay - by)**2 + (az - bz)**2) ** 0.5
+    return centers
 
-                # If centers are very close, edges are likely the same
-                if dist < tolerance:
-                    return True
 
-        return False
+def _centers_share_edge(centers_a, centers_b) -> bool:
+    """
+    Check if two faces share an edge, given their precomputed edge centers.
 
-    except Exception:
-        return False
+    Args:
+        centers_a: Edge centers of the first face (from _edge_centers)
+        centers_b: Edge centers of the second face (from _edge_centers)
+
+    Returns:
+        True if any pair of edge centers coincide within EDGE_MATCH_TOLERANCE
+    """
+    for ax, ay, az in centers_a:
+        for bx, by, bz in centers_b:
+            # Calculate distance between edge centers
+            dist = ((ax - bx)**2 + (ay - by)**2 + (az - bz)**2) ** 0.5
+
+            # If centers are very close, edges are likely the same
+            if dist < EDGE_MATCH_TOLERANCE:
+                return True
+
+    return False
 
 
 def _group_pocket_faces(pocket_faces, solid_bbox, debug=False) -> list:
@@ -558,12 +566,12 @@ def _group_pocket_faces(pocket_faces, solid_bbox, debug=False) -> list:
     # adjacency[i] = list of indices j where face i shares edge with face j
     adjacency = [[] for _ in range(n)]
 
+    # Edge centers are computed once per face, not once per face pair
+    edge_centers = [_edge_centers(face) for face, _, _ in pocket_faces]
+
     for i in range(n):
-        face_i = pocket_faces[i][0]
         for j in range(i + 1, n):
-            face_j = pocket_faces[j][0]
-
-            if _faces_share_edge(face_i, face_j):
+            if _centers_share_edge(edge_centers[i], edge_centers[j]):
                 adjacency[i].append(j)
                 adjacency[j].append(i)
                 if debug:
@@ -718,12 +726,34 @@ def detect_bbox_and_volume(step_path: str) -> Tuple[PartFeatures, FeatureConfide
         >>> print(f"Pockets: {features.pocket_count}, Volume: {features.pocket_total_volume}mm³")
         >>> print(f"Confidence: bbox={confidence.bounding_box}, holes={confidence.through_holes}, pockets={confidence.pockets}")
     """
+    # cad_io pulls in cadquery/OCCT; import it only when a file is loaded so
+    # validate_bounding_box_limits() and BoundingBoxLimitError stay light
+    from modules.cad_io import load_step
+
     # Load STEP file using cad_io module
     workplane = load_step(step_path)
 
     # Get the solid from the workplane
-    solid = workplane.val()
+    return detect_bbox_and_volume_from_shape(workplane.val())
+
+
+def detect_bbox_and_volume_from_shape(solid: "cq.Shape") -> Tuple[PartFeatures, FeatureConfidence]:
+    """
+    Detect features from an in-memory cadquery shape.
+
+    Same detection as detect_bbox_and_volume() without the STEP round-trip,
+    for callers that already hold the geometry (e.g. built with cadquery).
+
+    Args:
+        solid: cadquery Shape to analyze (e.g. Workplane.val())
 
+    Returns:
+        Tuple of (PartFeatures, FeatureConfidence), as for detect_bbox_and_volume()
+
+    Example:
+        >>> solid = cq.Workplane("XY").box(10, 20, 30).val()
+        >>> features, confidence = detect_bbox_and_volume_from_shape(solid)
+    """
     # Compute bounding box
     # BoundingBox() returns a bounding box with xmin, xmax, ymin, ymax, zmin, zmax
     bbox = solid.BoundingBox()
@@ -0,0 +1,137 @@
+"""
+Shared pytest fixtures and command-line options.
+
+Domain objects used by many tests are built once per session. Tests must
+treat them as read-only; copy them (copy.deepcopy) before mutating.
+"""
+import copy
+
+import pytest
+
+from modules.domain import (
+    PartFeatures,
+    FeatureConfidence,
+    DfmIssue,
+    QuoteResult,
+    ProcessingResult,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="also run tests marked slow (OCCT-heavy geometry tests)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow unless --runslow is given."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow; use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def default_features():
+    """PartFeatures with all defaults (zeros)."""
+    return PartFeatures()
+
+
+@pytest.fixture(scope="session")
+def custom_features():
+    """PartFeatures with every field set to a non-default value."""
+    return PartFeatures(
+        bounding_box_x=100.0,
+        bounding_box_y=80.0,
+        bounding_box_z=30.0,
+        volume=12500.0,
+        through_hole_count=4,
+        blind_hole_count=2,
+        blind_hole_avg_depth_to_diameter=3.5,
+        blind_hole_max_depth_to_diameter=5.0,
+        pocket_count=1,
+        pocket_total_volume=500.0,
+        pocket_avg_depth=10.0,
+        pocket_max_depth=10.0,
+        non_standard_hole_count=1,
+    )
+
+
+@pytest.fixture(scope="session")
+def default_confidence():
+    """FeatureConfidence with all defaults (zeros)."""
+    return FeatureConfidence()
+
+
+@pytest.fixture(scope="session")
+def custom_confidence():
+    """FeatureConfidence with typical detector scores."""
+    return FeatureConfidence(
+        bounding_box=1.0,
+        volume=1.0,
+        through_holes=0.92,
+        blind_holes=0.85,
+        pockets=0.78,
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_issue():
+    """Critical DfmIssue."""
+    return DfmIssue(
+        severity="critical",
+        message="Sharp internal corners detected",
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_quote():
+    """QuoteResult for 5 units with a small cost breakdown."""
+    return QuoteResult(
+        price_per_unit=45.50,
+        total_price=227.50,
+        quantity=5,
+        breakdown={"Base cost": 30.0, "Volume": 10.0, "Holes": 5.50},
+        minimum_applied=False,
+    )
+
+
+@pytest.fixture(scope="session")
+def serialized_domain(custom_features, custom_confidence, sample_issue, sample_quote):
+    """to_dict() output of the shared domain fixtures, keyed by fixture name."""
+    return {
+        "custom_features": custom_features.to_dict(),
+        "custom_confidence": custom_confidence.to_dict(),
+        "sample_issue": sample_issue.to_dict(),
+        "sample_quote": sample_quote.to_dict(),
+    }
+
+
+@pytest.fixture(scope="session")
+def processing_result_proto():
+    """Successful ProcessingResult shared by the whole session (read-only)."""
+    return ProcessingResult(
+        part_id="test-uuid-123",
+        step_file_path="/uploads/test.step",
+        stl_file_path="/temp/test.stl",
+        features=PartFeatures(bounding_box_x=100.0, volume=12500.0),
+        confidence=FeatureConfidence(bounding_box=1.0, volume=1.0),
+        dfm_issues=[],
+        quote=QuoteResult(
+            price_per_unit=50.0,
+            total_price=250.0,
+            quantity=5,
+            breakdown={},
+            minimum_applied=False,
+        ),
+        errors=[],
+    )
+
+
+@pytest.fixture
+def processing_result(processing_result_proto):
+    """Private deep copy of processing_result_proto that tests may mutate."""
+    return copy.deepcopy(processing_result_proto)
@@ -0,0 +1,94 @@
+"""
+Test suite for bounding box limit validation (600×400×500mm).
+
+Kept separate from test_feature_detector.py: these tests only need
+PartFeatures and Settings, so they run without importing cadquery.
+"""
+import pytest
+from modules.feature_detector import (
+    validate_bounding_box_limits,
+    BoundingBoxLimitError,
+)
+from modules.domain import PartFeatures
+from modules.settings import get_settings
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """Application settings, shared by the whole session (read-only)."""
+    return get_settings()
+
+
+class TestValidateBoundingBoxLimits:
+    """Test bounding box limit validation (600×400×500mm)."""
+
+    def test_import_function(self):
+        """Test that validate_bounding_box_limits can be imported."""
+        assert callable(validate_bounding_box_limits)
+
+    @pytest.mark.parametrize(
+        "x, y, z",
+        [
+            (100.0, 200.0, 300.0),  # Well within limits
+            (600.0, 200.0, 300.0),  # Exactly at X limit
+            (100.0, 400.0, 300.0),  # Exactly at Y limit
+            (100.0, 200.0, 500.0),  # Exactly at Z limit
+            (600.0, 400.0, 500.0),  # At all limits
+        ],
+    )
+    def test_within_limits_passes(self, settings, x, y, z):
+        """Test that parts at or below the limits do not raise."""
+        features = PartFeatures(bounding_box_x=x, bounding_box_y=y, bounding_box_z=z)
+
+        # Should not raise exception
+        validate_bounding_box_limits(features, settings)
+
+    @pytest.mark.parametrize(
+        "x, y, z",
+        [
+            (601.0, 200.0, 300.0),  # Exceeds X
+            (100.0, 401.0, 300.0),  # Exceeds Y
+            (100.0, 200.0, 501.0),  # Exceeds Z
+            (600.1, 200.0, 300.0),  # Slightly exceeds X (by 0.1mm)
+            (700.0, 500.0, 600.0),  # Exceeds all limits
+        ],
+    )
+    def test_exceeding_limits_raises(self, settings, x, y, z):
+        """Test that parts above any limit raise BoundingBoxLimitError."""
+        features = PartFeatures(bounding_box_x=x, bounding_box_y=y, bounding_box_z=z)
+
+        with pytest.raises(BoundingBoxLimitError):
+            validate_bounding_box_limits(features, settings)
+
+    def test_error_message_is_spec_aligned(self, settings):
+        """Test that error message matches spec exactly."""
+        features = PartFeatures(
+            bounding_box_x=601.0,
+            bounding_box_y=200.0,
+            bounding_box_z=300.0,
+        )
+
+        with pytest.raises(BoundingBoxLimitError) as exc_info:
+            validate_bounding_box_limits(features, settings)
+
+        # Spec says: "Part exceeds maximum dimensions of 600×400×500mm.
+        # Please contact us for large part quoting at david@wellsglobal.eu"
+        error_msg = str(exc_info.value)
+        assert "Part exceeds maximum dimensions" in error_msg
+        assert "600" in error_msg and "400" in error_msg and "500" in error_msg
+        assert "david@wellsglobal.eu" in error_msg
+
+    def test_error_message_contains_contact_info(self, settings):
+        """Test that error message contains contact information."""
+        features = PartFeatures(
+            bounding_box_x=700.0,
+            bounding_box_y=200.0,
+            bounding_box_z=300.0,
+        )
+
+        with pytest.raises(BoundingBoxLimitError) as exc_info:
+            validate_bounding_box_limits(features, settings)
+
+        error_msg = str(exc_info.value)
+        assert "contact" in error_msg.lower()
+        assert "david@wellsglobal.eu" in error_msg
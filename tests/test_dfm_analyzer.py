@@ -4,31 +4,43 @@ Tests for DFM (Design for Manufacturing) Analyzer
 Tests manufacturability issue detection and severity thresholds.
 """
 
+import collections
+import dataclasses
+
 import pytest
 from modules.dfm_analyzer import analyze_dfm
 from modules.domain import PartFeatures, DfmIssue
 
 
+# Baseline part: 100x100x50 mm block with no holes, pockets or DFM issues.
+# Tests derive their inputs from it with dataclasses.replace().
+_BASE = {
+    "bounding_box_x": 100.0,
+    "bounding_box_y": 100.0,
+    "bounding_box_z": 50.0,
+    "volume": 500000.0,
+    "through_hole_count": 0,
+    "blind_hole_count": 0,
+    "blind_hole_avg_depth_to_diameter": 0.0,
+    "blind_hole_max_depth_to_diameter": 0.0,
+    "pocket_count": 0,
+    "pocket_total_volume": 0.0,
+    "pocket_avg_depth": 0.0,
+    "pocket_max_depth": 0.0,
+    "non_standard_hole_count": 0,
+}
+CLEAN_PART = PartFeatures(**_BASE)
+
+_DFM_FIELD_NAMES = frozenset(f.name for f in dataclasses.fields(DfmIssue))
+_VALID_SEVERITIES = frozenset({"critical", "warning", "info"})
+
+
 class TestDeepHoleChecks:
     """Test deep hole detection based on depth-to-diameter ratio."""
 
     def test_no_holes_returns_no_issues(self):
         """No holes should return empty issue list."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
-            blind_hole_count=0,
-            blind_hole_avg_depth_to_diameter=0.0,
-            blind_hole_max_depth_to_diameter=0.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
-        )
+        features = CLEAN_PART
 
         issues = analyze_dfm(features)
         deep_hole_issues = [i for i in issues if "deep" in i.message.lower()]
@@ -37,20 +49,11 @@ class TestDeepHoleChecks:
 
     def test_shallow_holes_no_issue(self):
         """Shallow holes (ratio < 6) should not trigger warnings."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=2,
             blind_hole_avg_depth_to_diameter=3.0,
             blind_hole_max_depth_to_diameter=4.5,  # Below 6
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -60,20 +63,11 @@ class TestDeepHoleChecks:
 
     def test_medium_deep_hole_warning(self):
         """Holes with ratio 6-10 should trigger warning."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=7.5,
             blind_hole_max_depth_to_diameter=7.5,  # Between 6 and 10
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -86,20 +80,11 @@ class TestDeepHoleChecks:
 
     def test_very_deep_hole_critical(self):
         """Holes with ratio > 10 should trigger critical."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=8.0,
             blind_hole_max_depth_to_diameter=12.0,  # Above 10
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -112,20 +97,11 @@ class TestDeepHoleChecks:
 
     def test_exactly_at_warning_threshold(self):
         """Ratio exactly at 6.0 should trigger warning."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=6.0,
             blind_hole_max_depth_to_diameter=6.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -136,20 +112,11 @@ class TestDeepHoleChecks:
 
     def test_just_above_warning_threshold(self):
         """Ratio just above 6.0 should trigger warning."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=6.1,
             blind_hole_max_depth_to_diameter=6.1,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -160,20 +127,11 @@ class TestDeepHoleChecks:
 
     def test_exactly_at_critical_threshold(self):
         """Ratio exactly at 10.0 should not trigger critical (threshold is >)."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=10.0,
             blind_hole_max_depth_to_diameter=10.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -188,20 +146,11 @@ class TestDeepHoleChecks:
 
     def test_just_above_critical_threshold(self):
         """Ratio just above 10.0 should trigger critical."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=10.1,
             blind_hole_max_depth_to_diameter=10.1,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -216,21 +165,7 @@ class TestSmallFeatureChecks:
 
     def test_no_holes_no_small_feature_warning(self):
         """No holes should not trigger small feature warnings."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
-            blind_hole_count=0,
-            blind_hole_avg_depth_to_diameter=0.0,
-            blind_hole_max_depth_to_diameter=0.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
-        )
+        features = CLEAN_PART
 
         issues = analyze_dfm(features)
         small_feature_issues = [i for i in issues if "small" in i.message.lower() or "precision" in i.message.lower()]
@@ -239,20 +174,13 @@ class TestSmallFeatureChecks:
 
     def test_non_standard_holes_trigger_warning(self):
         """Non-standard holes might indicate small features (MVP heuristic)."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=2,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=3.0,
             blind_hole_max_depth_to_diameter=4.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=2
+            non_standard_hole_count=2,
         )
 
         issues = analyze_dfm(features)
@@ -260,7 +188,7 @@ class TestSmallFeatureChecks:
 
         # Should have warning about non-standard holes potentially being small
         assert len(small_feature_issues) >= 1
-        assert any(i.severity == "warning" for i in small_feature_issues)
+        assert "warning" in {i.severity for i in small_feature_issues}
 
 
 class TestNonStandardHoleChecks:
@@ -268,20 +196,12 @@ class TestNonStandardHoleChecks:
 
     def test_no_non_standard_holes_no_issue(self):
         """No non-standard holes should not trigger issues."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=3,
             blind_hole_count=2,
             blind_hole_avg_depth_to_diameter=3.0,
             blind_hole_max_depth_to_diameter=4.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=0
         )
 
         issues = analyze_dfm(features)
@@ -291,20 +211,13 @@ class TestNonStandardHoleChecks:
 
     def test_non_standard_holes_info_message(self):
         """Non-standard holes should trigger info message."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=2,
             blind_hole_count=1,
             blind_hole_avg_depth_to_diameter=3.0,
             blind_hole_max_depth_to_diameter=4.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=1
+            non_standard_hole_count=1,
         )
 
         issues = analyze_dfm(features)
@@ -312,24 +225,17 @@ class TestNonStandardHoleChecks:
 
         assert len(non_standard_issues) >= 1
         # At least one should be info severity
-        assert any(i.severity == "info" for i in non_standard_issues)
+        assert "info" in {i.severity for i in non_standard_issues}
 
     def test_multiple_non_standard_holes_reported(self):
         """Multiple non-standard holes should be mentioned in message."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=5,
             blind_hole_count=2,
             blind_hole_avg_depth_to_diameter=3.0,
             blind_hole_max_depth_to_diameter=4.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=3
+            non_standard_hole_count=3,
         )
 
         issues = analyze_dfm(features)
@@ -345,42 +251,35 @@ class TestMultipleIssues:
 
     def test_multiple_issues_all_reported(self):
         """Part with multiple issues should report all of them."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=2,
             blind_hole_count=2,
             blind_hole_avg_depth_to_diameter=8.0,
             blind_hole_max_depth_to_diameter=11.0,  # Critical deep hole
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=2  # Non-standard holes
+            non_standard_hole_count=2,  # Non-standard holes
         )
 
         issues = analyze_dfm(features)
 
+        # Tally severities and deep-hole messages in a single pass
+        counts = collections.Counter()
+        for i in issues:
+            counts[i.severity] += 1
+            if "deep" in i.message.lower():
+                counts["_deep"] += 1
+
         # Should have at least 2 issues (deep hole + non-standard)
         assert len(issues) >= 2
-
-        # Check for deep hole critical issue
-        critical_issues = [i for i in issues if i.severity == "critical"]
-        assert len(critical_issues) >= 1
-
-        # Check for non-standard hole info
-        info_issues = [i for i in issues if i.severity == "info"]
-        assert len(info_issues) >= 1
+        # Deep hole critical issue
+        assert counts["critical"] >= 1 and counts["_deep"] >= 1
+        # Non-standard hole info
+        assert counts["info"] >= 1
 
     def test_clean_part_no_issues(self):
         """Part with no manufacturability concerns should return empty list."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
+        features = dataclasses.replace(
+            CLEAN_PART,
             through_hole_count=3,
             blind_hole_count=2,
             blind_hole_avg_depth_to_diameter=2.5,
@@ -389,7 +288,6 @@ class TestMultipleIssues:
             pocket_total_volume=5000.0,
             pocket_avg_depth=10.0,
             pocket_max_depth=10.0,
-            non_standard_hole_count=0  # All standard
         )
 
         issues = analyze_dfm(features)
@@ -397,56 +295,32 @@ class TestMultipleIssues:
         assert len(issues) == 0
 
 
+@pytest.fixture(scope="module")
+def all_issues():
+    """Issues for a part that triggers every severity level (analyzed once)."""
+    features = dataclasses.replace(
+        CLEAN_PART,
+        through_hole_count=2,
+        blind_hole_count=2,
+        blind_hole_avg_depth_to_diameter=8.0,
+        blind_hole_max_depth_to_diameter=15.0,  # Critical
+        non_standard_hole_count=3,
+    )
+
+    return analyze_dfm(features)
+
+
 class TestDfmIssueFormat:
     """Test that DfmIssue objects are properly formatted."""
 
-    def test_issue_has_required_fields(self):
+    def test_issue_has_required_fields(self, all_issues):
         """Each issue should have severity and message."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=0,
-            blind_hole_count=1,
-            blind_hole_avg_depth_to_diameter=7.0,
-            blind_hole_max_depth_to_diameter=7.0,
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=1
-        )
-
-        issues = analyze_dfm(features)
+        assert {"severity", "message"} <= _DFM_FIELD_NAMES
+        for issue in all_issues:
+            assert isinstance(issue.message, str) and issue.message
 
-        for issue in issues:
-            assert hasattr(issue, 'severity')
-            assert hasattr(issue, 'message')
-            assert issue.severity in ['critical', 'warning', 'info']
-            assert isinstance(issue.message, str)
-            assert len(issue.message) > 0
-
-    def test_severity_levels_are_valid(self):
+    def test_severity_levels_are_valid(self, all_issues):
         """All severity levels should be valid literals."""
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=100.0,
-            bounding_box_z=50.0,
-            volume=500000.0,
-            through_hole_count=2,
-            blind_hole_count=2,
-            blind_hole_avg_depth_to_diameter=8.0,
-            blind_hole_max_depth_to_diameter=15.0,  # Critical
-            pocket_count=0,
-            pocket_total_volume=0.0,
-            pocket_avg_depth=0.0,
-            pocket_max_depth=0.0,
-            non_standard_hole_count=3
-        )
-
-        issues = analyze_dfm(features)
-
-        valid_severities = {'critical', 'warning', 'info'}
-        for issue in issues:
-            assert issue.severity in valid_severities
+        assert len(all_issues) > 0
+        for issue in all_issues:
+            assert issue.severity in _VALID_SEVERITIES
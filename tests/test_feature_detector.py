@@ -2,52 +2,51 @@
 Test suite for feature detection (bounding box and volume).
 Following TDD - tests written first.
 """
-import os
-import tempfile
+import functools
+import operator
 import pytest
 import cadquery as cq
 from modules.feature_detector import (
     detect_bbox_and_volume,
-    validate_bounding_box_limits,
-    BoundingBoxLimitError,
+    detect_bbox_and_volume_from_shape,
 )
+from modules.cad_io import StepLoadError
 from modules.domain import PartFeatures, FeatureConfidence
 
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
-
-
-@pytest.fixture
-def box_10x20x30(temp_dir):
-    """Create a 10×20×30mm box STEP file."""
-    # Create box with precise dimensions
-    box = cq.Workplane("XY").box(10, 20, 30)
-
-    step_path = os.path.join(temp_dir, "box_10x20x30.step")
-    cq.exporters.export(box, step_path)
+def _export_session_step(shape, step_dir, name):
+    """
+    Export a shared fixture shape to step_dir/name and return the path.
 
+    P-curves roughly double the size of exported STEP files and the
+    detector does not need them, so they are left out.
+    """
+    step_path = str(step_dir / name)
+    cq.exporters.export(shape, step_path, opt={"write_pcurves": False})
     return step_path
 
 
-@pytest.fixture
-def box_5x5x5(temp_dir):
-    """Create a 5×5×5mm cube STEP file."""
-    cube = cq.Workplane("XY").box(5, 5, 5)
-
-    step_path = os.path.join(temp_dir, "cube_5x5x5.step")
-    cq.exporters.export(cube, step_path)
-
-    return step_path
+@pytest.fixture(scope="session")
+def step_dir(tmp_path_factory):
+    """Session-wide directory for the shared (read-only) STEP fixtures."""
+    return tmp_path_factory.mktemp("steps")
 
 
-@pytest.fixture
-def complex_shape(temp_dir):
-    """Create a more complex shape for testing."""
-    # Create a box with a hole (but we won't detect the hole yet)
+@pytest.fixture(
+    scope="session", params=[(10, 20, 30), (5, 5, 5)], ids=["10x20x30", "5x5x5"]
+)
+def plain_box(request, step_dir):
+    """Plain box STEP file and its (x, y, z) dimensions (exported once per session)."""
+    dims = request.param
+    # Direct solid, no Workplane stack
+    box = cq.Solid.makeBox(*dims)
+    name = "box_{}x{}x{}.step".format(*dims)
+    return _export_session_step(box, step_dir, name), dims
+
+
+@pytest.fixture(scope="session")
+def box_50x40x20_one_hole(step_dir):
+    """50×40×20mm box with one 5mm through hole (exported once per session)."""
     shape = (
         cq.Workplane("XY")
         .box(50, 40, 20)
@@ -55,74 +54,74 @@ def complex_shape(temp_dir):
         .workplane()
         .hole(5)
     )
+    return _export_session_step(shape, step_dir, "box_50x40x20_one_hole.step")
 
-    step_path = os.path.join(temp_dir, "complex.step")
-    cq.exporters.export(shape, step_path)
 
-    return step_path
+@pytest.fixture(scope="session")
+def complex_shape(box_50x40x20_one_hole):
+    """A more complex shape for testing: box with one hole."""
+    return box_50x40x20_one_hole
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_detect(step_path):
+    """
+    detect_bbox_and_volume() memoized by path, for the read-only session fixtures.
+
+    Only use with the session STEP fixtures, whose files never change.
+    Callers must not mutate the returned objects.
+    """
+    return detect_bbox_and_volume(step_path)
+
+
+def _assert_bbox(features, expected_xyz, tolerance=0.1):
+    """Assert bounding box dimensions match expected_xyz within tolerance (mm)."""
+    actual = (features.bounding_box_x, features.bounding_box_y, features.bounding_box_z)
+    assert actual == pytest.approx(expected_xyz, abs=tolerance)
+
+
+@pytest.mark.xdist_group(name="feature_detector_bbox")
 class TestDetectBboxAndVolume:
     """Test bounding box and volume detection."""
 
-    def test_returns_tuple_of_features_and_confidence(self, box_10x20x30):
+    def test_returns_tuple_of_features_and_confidence(self, plain_box):
         """Test that function returns (PartFeatures, FeatureConfidence) tuple."""
-        result = detect_bbox_and_volume(box_10x20x30)
+        step_path, _ = plain_box
+        result = _cached_detect(step_path)
 
         assert isinstance(result, tuple)
         assert len(result) == 2
         assert isinstance(result[0], PartFeatures)
         assert isinstance(result[1], FeatureConfidence)
 
-    def test_box_10x20x30_dimensions(self, box_10x20x30):
-        """Test that 10×20×30mm box has correct bounding box dimensions."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
+    def test_plain_box_dimensions(self, plain_box):
+        """Test that a plain box has correct bounding box dimensions."""
+        step_path, dims = plain_box
+        features, confidence = _cached_detect(step_path)
 
         # Bounding box should match dimensions (within tolerance)
-        tolerance = 0.1  # 0.1mm tolerance
-        assert abs(features.bounding_box_x - 10.0) < tolerance
-        assert abs(features.bounding_box_y - 20.0) < tolerance
-        assert abs(features.bounding_box_z - 30.0) < tolerance
+        _assert_bbox(features, dims)
 
-    def test_box_10x20x30_volume(self, box_10x20x30):
-        """Test that 10×20×30mm box has volume of 6000mm³."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
+    def test_plain_box_volume(self, plain_box):
+        """Test that a plain box has volume x × y × z."""
+        step_path, (x, y, z) = plain_box
+        features, confidence = _cached_detect(step_path)
 
-        # Volume should be 10 × 20 × 30 = 6000 mm³
-        expected_volume = 6000.0
+        # e.g. 10 × 20 × 30 = 6000 mm³
+        expected_volume = float(x * y * z)
         tolerance = 1.0  # 1mm³ tolerance
         assert abs(features.volume - expected_volume) < tolerance
 
-    def test_cube_5x5x5_dimensions(self, box_5x5x5):
-        """Test that 5×5×5mm cube has correct dimensions."""
-        features, confidence = detect_bbox_and_volume(box_5x5x5)
-
-        tolerance = 0.1
-        assert abs(features.bounding_box_x - 5.0) < tolerance
-        assert abs(features.bounding_box_y - 5.0) < tolerance
-        assert abs(features.bounding_box_z - 5.0) < tolerance
-
-    def test_cube_5x5x5_volume(self, box_5x5x5):
-        """Test that 5×5×5mm cube has volume of 125mm³."""
-        features, confidence = detect_bbox_and_volume(box_5x5x5)
-
-        expected_volume = 125.0  # 5³
-        tolerance = 1.0
-        assert abs(features.volume - expected_volume) < tolerance
-
     def test_complex_shape_has_bbox(self, complex_shape):
         """Test that complex shape has valid bounding box."""
-        features, confidence = detect_bbox_and_volume(complex_shape)
+        features, confidence = _cached_detect(complex_shape)
 
         # Should have dimensions around 50×40×20
-        tolerance = 0.1
-        assert abs(features.bounding_box_x - 50.0) < tolerance
-        assert abs(features.bounding_box_y - 40.0) < tolerance
-        assert abs(features.bounding_box_z - 20.0) < tolerance
+        _assert_bbox(features, (50.0, 40.0, 20.0))
 
     def test_complex_shape_volume_less_than_bbox_volume(self, complex_shape):
         """Test that shape with hole has volume less than bbox volume."""
-        features, confidence = detect_bbox_and_volume(complex_shape)
+        features, confidence = _cached_detect(complex_shape)
 
         # Bbox volume would be 50×40×20 = 40000 mm³
         # But actual volume should be less (because of the hole)
@@ -130,381 +129,203 @@ class TestDetectBboxAndVolume:
         assert features.volume < bbox_volume
         assert features.volume > 0
 
-    def test_confidence_for_bbox_is_1_0(self, box_10x20x30):
-        """Test that confidence for bounding box detection is 1.0."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert confidence.bounding_box == 1.0
-
-    def test_confidence_for_volume_is_1_0(self, box_10x20x30):
-        """Test that confidence for volume detection is 1.0."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert confidence.volume == 1.0
-
-    def test_holes_remain_zero(self, box_10x20x30):
-        """Test that hole counts remain zero (not detected yet)."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert features.through_hole_count == 0
-        assert features.blind_hole_count == 0
-        assert features.blind_hole_avg_depth_to_diameter == 0.0
-        assert features.blind_hole_max_depth_to_diameter == 0.0
-
-    def test_pockets_remain_zero(self, box_10x20x30):
-        """Test that pocket features remain zero (not detected yet)."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert features.pocket_count == 0
-        assert features.pocket_total_volume == 0.0
-        assert features.pocket_avg_depth == 0.0
-        assert features.pocket_max_depth == 0.0
-
-    def test_non_standard_holes_remain_zero(self, box_10x20x30):
-        """Test that non-standard hole count remains zero."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert features.non_standard_hole_count == 0
-
-    def test_other_confidences_remain_zero(self, box_10x20x30):
-        """Test that confidences for undetected features remain 0.0."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
+    @pytest.mark.parametrize(
+        "part, attr, op, expected",
+        [
+            # bbox and volume are deterministic
+            ("confidence", "bounding_box", operator.eq, 1.0),
+            ("confidence", "volume", operator.eq, 1.0),
+            ("features", "bounding_box_x", operator.gt, 0),
+            ("features", "bounding_box_y", operator.gt, 0),
+            ("features", "bounding_box_z", operator.gt, 0),
+            ("features", "volume", operator.gt, 0),
+            # A plain box has no holes
+            ("features", "through_hole_count", operator.eq, 0),
+            ("features", "blind_hole_count", operator.eq, 0),
+            ("features", "blind_hole_avg_depth_to_diameter", operator.eq, 0.0),
+            ("features", "blind_hole_max_depth_to_diameter", operator.eq, 0.0),
+            ("features", "non_standard_hole_count", operator.eq, 0),
+            # ... and no pockets
+            ("features", "pocket_count", operator.eq, 0),
+            ("features", "pocket_total_volume", operator.eq, 0.0),
+            ("features", "pocket_avg_depth", operator.eq, 0.0),
+            ("features", "pocket_max_depth", operator.eq, 0.0),
+            # Confidences for undetected features remain 0.0
+            ("confidence", "through_holes", operator.eq, 0.0),
+            ("confidence", "blind_holes", operator.eq, 0.0),
+            ("confidence", "pockets", operator.eq, 0.0),
+        ],
+    )
+    def test_plain_box_field(self, plain_box, part, attr, op, expected):
+        """Test one field of the detection result for a plain box."""
+        step_path, _ = plain_box
+        features, confidence = _cached_detect(step_path)
+        result = {"features": features, "confidence": confidence}[part]
 
-        assert confidence.through_holes == 0.0
-        assert confidence.blind_holes == 0.0
-        assert confidence.pockets == 0.0
+        assert op(getattr(result, attr), expected)
 
-    def test_nonexistent_file_raises_error(self, temp_dir):
+    def test_nonexistent_file_raises_error(self, tmp_path):
         """Test that nonexistent file raises appropriate error."""
-        nonexistent = os.path.join(temp_dir, "nonexistent.step")
+        nonexistent = str(tmp_path / "nonexistent.step")
 
-        # Should raise an error (likely from cad_io.load_step)
-        with pytest.raises(Exception):
+        # load_step() rejects missing files before OCCT is involved
+        with pytest.raises(StepLoadError, match="not found"):
             detect_bbox_and_volume(nonexistent)
 
-    def test_bbox_values_are_positive(self, box_10x20x30):
-        """Test that all bounding box values are positive."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert features.bounding_box_x > 0
-        assert features.bounding_box_y > 0
-        assert features.bounding_box_z > 0
-
-    def test_volume_is_positive(self, box_10x20x30):
-        """Test that volume is positive."""
-        features, confidence = detect_bbox_and_volume(box_10x20x30)
-
-        assert features.volume > 0
-
-
-class TestValidateBoundingBoxLimits:
-    """Test bounding box limit validation (600×400×500mm)."""
-
-    def test_import_function(self):
-        """Test that validate_bounding_box_limits can be imported."""
-        assert callable(validate_bounding_box_limits)
-
-    def test_part_within_limits_passes(self):
-        """Test that part within limits does not raise exception."""
-        from modules.settings import get_settings
-
-        # Create features for a small part (100×200×300mm)
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
-
-        # Should not raise exception
-        validate_bounding_box_limits(features, settings)
-
-    def test_part_exactly_at_x_limit_passes(self):
-        """Test that part exactly at X limit (600mm) passes."""
-        from modules.settings import get_settings
 
-        features = PartFeatures(
-            bounding_box_x=600.0,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
-
-        # Should not raise exception
-        validate_bounding_box_limits(features, settings)
-
-    def test_part_exactly_at_y_limit_passes(self):
-        """Test that part exactly at Y limit (400mm) passes."""
-        from modules.settings import get_settings
-
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=400.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
-
-        # Should not raise exception
-        validate_bounding_box_limits(features, settings)
-
-    def test_part_exactly_at_z_limit_passes(self):
-        """Test that part exactly at Z limit (500mm) passes."""
-        from modules.settings import get_settings
-
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=200.0,
-            bounding_box_z=500.0,
-        )
-        settings = get_settings()
-
-        # Should not raise exception
-        validate_bounding_box_limits(features, settings)
+@pytest.mark.xdist_group(name="feature_detector_from_shape")
+class TestDetectBboxAndVolumeFromShape:
+    """Test feature detection on in-memory shapes (no STEP round-trip)."""
 
-    def test_part_at_all_limits_passes(self):
-        """Test that part at all limits (600×400×500mm) passes."""
-        from modules.settings import get_settings
-
-        features = PartFeatures(
-            bounding_box_x=600.0,
-            bounding_box_y=400.0,
-            bounding_box_z=500.0,
-        )
-        settings = get_settings()
+    def test_box_10x20x30_from_shape(self):
+        """Test that an in-memory 10×20×30mm box is measured correctly."""
+        solid = cq.Workplane("XY").box(10, 20, 30).val()
 
-        # Should not raise exception
-        validate_bounding_box_limits(features, settings)
+        features, confidence = detect_bbox_and_volume_from_shape(solid)
 
-    def test_part_exceeding_x_limit_raises(self):
-        """Test that part exceeding X limit raises exception."""
-        from modules.settings import get_settings
+        _assert_bbox(features, (10.0, 20.0, 30.0))
+        assert abs(features.volume - 6000.0) < 1.0
+        assert confidence.bounding_box == 1.0
 
-        # X dimension: 601mm (exceeds 600mm limit)
-        features = PartFeatures(
-            bounding_box_x=601.0,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
+    def test_matches_step_file_detection(self, complex_shape):
+        """Test that shape and STEP entrypoints agree for the same geometry."""
+        solid = (
+            cq.Workplane("XY")
+            .box(50, 40, 20)
+            .faces(">Z")
+            .workplane()
+            .hole(5)
+            .val()
         )
-        settings = get_settings()
 
-        with pytest.raises(BoundingBoxLimitError) as exc_info:
-            validate_bounding_box_limits(features, settings)
+        from_shape, _ = detect_bbox_and_volume_from_shape(solid)
+        from_file, _ = _cached_detect(complex_shape)
 
-        # Check error message mentions dimensions
-        error_msg = str(exc_info.value)
-        assert "600" in error_msg or "400" in error_msg or "500" in error_msg
+        assert abs(from_shape.volume - from_file.volume) < 1.0
+        assert from_shape.through_hole_count == from_file.through_hole_count
 
-    def test_part_exceeding_y_limit_raises(self):
-        """Test that part exceeding Y limit raises exception."""
-        from modules.settings import get_settings
 
-        # Y dimension: 401mm (exceeds 400mm limit)
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=401.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
+@pytest.fixture(scope="session")
+def box_no_holes(step_dir):
+    """50×40×20mm box with no holes."""
+    box = cq.Workplane("XY").box(50, 40, 20)
+    return _export_session_step(box, step_dir, "box_no_holes.step")
 
-        with pytest.raises(BoundingBoxLimitError):
-            validate_bounding_box_limits(features, settings)
 
-    def test_part_exceeding_z_limit_raises(self):
-        """Test that part exceeding Z limit raises exception."""
-        from modules.settings import get_settings
+@pytest.fixture(scope="session")
+def box_one_through_hole(box_50x40x20_one_hole):
+    """50×40×20mm box with one 5mm through hole."""
+    return box_50x40x20_one_hole
 
-        # Z dimension: 501mm (exceeds 500mm limit)
-        features = PartFeatures(
-            bounding_box_x=100.0,
-            bounding_box_y=200.0,
-            bounding_box_z=501.0,
-        )
-        settings = get_settings()
 
-        with pytest.raises(BoundingBoxLimitError):
-            validate_bounding_box_limits(features, settings)
+@pytest.fixture(scope="session")
+def box_two_through_holes(step_dir):
+    """50×40×20mm box with two 4mm through holes."""
+    box_with_holes = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-10, 0), (10, 0)])
+        .hole(4)
+    )
+    return _export_session_step(box_with_holes, step_dir, "box_two_through_holes.step")
 
-    def test_part_slightly_exceeding_x_limit_raises(self):
-        """Test that part slightly exceeding X limit (by 0.1mm) raises exception."""
-        from modules.settings import get_settings
 
-        # X dimension: 600.1mm (slightly exceeds 600mm limit)
-        features = PartFeatures(
-            bounding_box_x=600.1,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
+@pytest.fixture(scope="session")
+def box_blind_hole(step_dir):
+    """50×40×20mm box with one 5mm blind hole, 10mm deep."""
+    box_with_blind = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .circle(2.5)
+        .cutBlind(-10)
+    )
+    return _export_session_step(box_with_blind, step_dir, "box_blind_hole.step")
 
-        with pytest.raises(BoundingBoxLimitError):
-            validate_bounding_box_limits(features, settings)
 
-    def test_part_exceeding_multiple_limits_raises(self):
-        """Test that part exceeding multiple limits raises exception."""
-        from modules.settings import get_settings
+@pytest.fixture(scope="session")
+def box_mixed_holes(step_dir):
+    """60×50×20mm box with two through holes and one blind hole."""
+    box = (
+        cq.Workplane("XY")
+        .box(60, 50, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0), (15, 0)])
+        .hole(4)  # Two through holes
+        .pushPoints([(0, 10)])
+        .circle(3)
+        .cutBlind(-8)  # One blind hole
+    )
+    return _export_session_step(box, step_dir, "box_mixed_holes.step")
 
-        features = PartFeatures(
-            bounding_box_x=700.0,  # Exceeds 600mm
-            bounding_box_y=500.0,  # Exceeds 400mm
-            bounding_box_z=600.0,  # Exceeds 500mm
-        )
-        settings = get_settings()
 
-        with pytest.raises(BoundingBoxLimitError):
-            validate_bounding_box_limits(features, settings)
+@pytest.fixture(scope="session")
+def box_for_confidence(box_50x40x20_one_hole):
+    """50×40×20mm box with one 5mm through hole, for confidence checks."""
+    return box_50x40x20_one_hole
 
-    def test_error_message_is_spec_aligned(self):
-        """Test that error message matches spec exactly."""
-        from modules.settings import get_settings
 
-        features = PartFeatures(
-            bounding_box_x=601.0,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
-
-        with pytest.raises(BoundingBoxLimitError) as exc_info:
-            validate_bounding_box_limits(features, settings)
-
-        # Spec says: "Part exceeds maximum dimensions of 600×400×500mm.
-        # Please contact us for large part quoting at david@wellsglobal.eu"
-        error_msg = str(exc_info.value)
-        assert "Part exceeds maximum dimensions" in error_msg
-        assert "600" in error_msg and "400" in error_msg and "500" in error_msg
-        assert "david@wellsglobal.eu" in error_msg
-
-    def test_error_message_contains_contact_info(self):
-        """Test that error message contains contact information."""
-        from modules.settings import get_settings
-
-        features = PartFeatures(
-            bounding_box_x=700.0,
-            bounding_box_y=200.0,
-            bounding_box_z=300.0,
-        )
-        settings = get_settings()
+@pytest.fixture(scope="session")
+def complex_for_conservative(box_50x40x20_one_hole):
+    """50×40×20mm box with exactly one 5mm hole."""
+    return box_50x40x20_one_hole
 
-        with pytest.raises(BoundingBoxLimitError) as exc_info:
-            validate_bounding_box_limits(features, settings)
 
-        error_msg = str(exc_info.value)
-        assert "contact" in error_msg.lower()
-        assert "david@wellsglobal.eu" in error_msg
+@pytest.fixture(scope="session")
+def complex_geometry(step_dir):
+    """60×50×30mm box with top through holes and a side blind hole."""
+    complex = (
+        cq.Workplane("XY")
+        .box(60, 50, 30)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-10, -10), (10, 10)])
+        .hole(6)
+        .faces(">X")
+        .workplane()
+        .circle(4)
+        .cutBlind(-15)
+    )
+    return _export_session_step(complex, step_dir, "complex_geometry.step")
 
 
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="feature_detector_hole_candidates")
 class TestDetectHoleCandidates:
     """Test hole candidate detection (cylindrical faces)."""
 
-    def test_box_with_no_holes_detects_zero(self, temp_dir):
+    def test_box_with_no_holes_detects_zero(self, box_no_holes):
         """Test that a simple box with no holes detects 0 hole candidates."""
-        # Create a simple box with no holes
-        box = cq.Workplane("XY").box(50, 40, 20)
-        step_path = os.path.join(temp_dir, "box_no_holes.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_no_holes)
 
         # Should detect 0 holes
         assert features.through_hole_count == 0
         assert features.blind_hole_count == 0
 
-    def test_box_with_one_through_hole(self, temp_dir):
-        """Test detection of single through hole."""
-        # Create box with one through hole (5mm diameter)
-        box_with_hole = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5)
-        )
-        step_path = os.path.join(temp_dir, "box_one_through_hole.step")
-        cq.exporters.export(box_with_hole, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
-
-        # Should detect at least 1 hole total (conservative: may undercount)
-        total_holes = features.through_hole_count + features.blind_hole_count
-        assert total_holes >= 1
-
-    def test_box_with_two_through_holes(self, temp_dir):
-        """Test detection of two through holes."""
-        # Create box with two through holes
-        box_with_holes = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-10, 0), (10, 0)])
-            .hole(4)
-        )
-        step_path = os.path.join(temp_dir, "box_two_through_holes.step")
-        cq.exporters.export(box_with_holes, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
-
-        # Should detect at least 2 holes total (conservative)
-        total_holes = features.through_hole_count + features.blind_hole_count
-        assert total_holes >= 2
-
-    def test_box_with_blind_hole(self, temp_dir):
-        """Test detection of blind hole."""
-        # Create box with one blind hole (depth 10mm)
-        box_with_blind = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(2.5)
-            .cutBlind(-10)
-        )
-        step_path = os.path.join(temp_dir, "box_blind_hole.step")
-        cq.exporters.export(box_with_blind, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
-
-        # Should detect at least 1 hole total
-        total_holes = features.through_hole_count + features.blind_hole_count
-        assert total_holes >= 1
-
-    def test_box_with_multiple_holes_mixed(self, temp_dir):
-        """Test detection of multiple holes (mix of through and blind)."""
-        # Create box with 2 through holes and 1 blind hole
-        box = (
-            cq.Workplane("XY")
-            .box(60, 50, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0), (15, 0)])
-            .hole(4)  # Two through holes
-            .pushPoints([(0, 10)])
-            .circle(3)
-            .cutBlind(-8)  # One blind hole
-        )
-        step_path = os.path.join(temp_dir, "box_mixed_holes.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+    @pytest.mark.parametrize(
+        "fixture_name, min_holes",
+        [
+            ("box_one_through_hole", 1),
+            ("box_two_through_holes", 2),
+            ("box_blind_hole", 1),
+            ("box_mixed_holes", 3),  # 2 through + 1 blind
+        ],
+    )
+    def test_box_with_holes_detects_at_least(self, request, fixture_name, min_holes):
+        """Test that boxes with holes detect at least the known hole count."""
+        features, confidence = _cached_detect(request.getfixturevalue(fixture_name))
 
-        # Should detect at least 3 holes total (conservative)
+        # Conservative detection may undercount, but should find these
         total_holes = features.through_hole_count + features.blind_hole_count
-        assert total_holes >= 3
+        assert total_holes >= min_holes
 
-    def test_confidence_for_holes_less_than_one(self, temp_dir):
+    def test_confidence_for_holes_less_than_one(self, box_for_confidence):
         """Test that hole detection confidence is less than 1.0 (heuristic)."""
-        # Create box with holes
-        box_with_hole = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5)
-        )
-        step_path = os.path.join(temp_dir, "box_for_confidence.step")
-        cq.exporters.export(box_with_hole, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_for_confidence)
 
         # Hole detection is heuristic, so confidence should be < 1.0
         # (unless we detect 0 holes, in which case it might be 0.0)
@@ -514,69 +335,91 @@ class TestDetectHoleCandidates:
             hole_confidence = max(confidence.through_holes, confidence.blind_holes)
             assert 0.0 < hole_confidence <= 1.0
 
-    def test_conservative_detection_undercounts_if_uncertain(self, temp_dir):
+    def test_conservative_detection_undercounts_if_uncertain(self, complex_for_conservative):
         """Test that detection is conservative (undercounts rather than overcounts)."""
-        # Create a complex part where detection might be uncertain
-        complex_part = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5)
-        )
-        step_path = os.path.join(temp_dir, "complex_for_conservative.step")
-        cq.exporters.export(complex_part, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(complex_for_conservative)
 
         # Total holes should not exceed actual holes (conservative)
         total_holes = features.through_hole_count + features.blind_hole_count
         # We know there's 1 hole, so should detect 0 or 1 (not 2+)
         assert total_holes <= 1
 
-    def test_hole_detection_does_not_crash_on_complex_geometry(self, temp_dir):
+    def test_hole_detection_does_not_crash_on_complex_geometry(self, complex_geometry):
         """Test that hole detection handles complex geometry without crashing."""
-        # Create a part with multiple operations
-        complex = (
-            cq.Workplane("XY")
-            .box(60, 50, 30)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-10, -10), (10, 10)])
-            .hole(6)
-            .faces(">X")
-            .workplane()
-            .circle(4)
-            .cutBlind(-15)
-        )
-        step_path = os.path.join(temp_dir, "complex_geometry.step")
-        cq.exporters.export(complex, step_path)
-
         # Should not crash
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(complex_geometry)
 
         # Should return valid features
         assert isinstance(features, PartFeatures)
         assert isinstance(confidence, FeatureConfidence)
 
 
+@pytest.fixture(scope="session")
+def box_through_hole(step_dir):
+    """Box with one through hole."""
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .hole(6)  # Through hole, 6mm diameter
+    )
+    return _export_session_step(box, step_dir, "through_hole.step")
+
+
+@pytest.fixture(scope="session")
+def box_6mm_blind_hole(step_dir):
+    """Box with one blind hole."""
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .circle(3)  # 6mm diameter
+        .cutBlind(-10)  # 10mm depth
+    )
+    return _export_session_step(box, step_dir, "blind_hole.step")
+
+
+@pytest.fixture(scope="session")
+def box_through_and_blind_holes(step_dir):
+    """Box with 1 through hole and 1 blind hole."""
+    box = (
+        cq.Workplane("XY")
+        .box(60, 50, 30)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0)])
+        .hole(5)  # Through hole
+        .pushPoints([(15, 0)])
+        .circle(2.5)  # 5mm diameter
+        .cutBlind(-15)  # Blind hole
+    )
+    return _export_session_step(box, step_dir, "mixed_holes.step")
+
+
+@pytest.fixture(scope="session")
+def box_three_through(step_dir):
+    """Box with 3 through holes."""
+    box = (
+        cq.Workplane("XY")
+        .box(80, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-20, 0), (0, 0), (20, 0)])
+        .hole(4)
+    )
+    return _export_session_step(box, step_dir, "three_through.step")
+
+
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="feature_detector_hole_classification")
 class TestClassifyThroughVsBlindHoles:
     """Test classification of through vs blind holes."""
 
-    def test_through_hole_classified_correctly(self, temp_dir):
+    def test_through_hole_classified_correctly(self, box_through_hole):
         """Test that through hole is classified as through (not blind)."""
-        # Create box with one through hole
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(6)  # Through hole, 6mm diameter
-        )
-        step_path = os.path.join(temp_dir, "through_hole.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_through_hole)
 
         # Should have through_hole_count >= 1
         assert features.through_hole_count >= 1
@@ -585,163 +428,134 @@ class TestClassifyThroughVsBlindHoles:
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 1
 
-    def test_blind_hole_classified_correctly(self, temp_dir):
+    def test_blind_hole_classified_correctly(self, box_6mm_blind_hole):
         """Test that blind hole is classified as blind (not through)."""
-        # Create box with one blind hole
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(3)  # 6mm diameter
-            .cutBlind(-10)  # 10mm depth
-        )
-        step_path = os.path.join(temp_dir, "blind_hole.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_6mm_blind_hole)
 
         # Should detect at least 1 hole
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 1
         # Classification may vary, so we just verify detection
 
-    def test_mixed_holes_both_classified(self, temp_dir):
+    def test_mixed_holes_both_classified(self, box_through_and_blind_holes):
         """Test that mix of through and blind holes are both detected."""
-        # Create box with 1 through hole and 1 blind hole
-        box = (
-            cq.Workplane("XY")
-            .box(60, 50, 30)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0)])
-            .hole(5)  # Through hole
-            .pushPoints([(15, 0)])
-            .circle(2.5)  # 5mm diameter
-            .cutBlind(-15)  # Blind hole
-        )
-        step_path = os.path.join(temp_dir, "mixed_holes.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_through_and_blind_holes)
 
         # Should detect at least 2 holes total
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 2
 
-    def test_multiple_through_holes_all_classified(self, temp_dir):
+    def test_multiple_through_holes_all_classified(self, box_three_through):
         """Test that multiple through holes are all detected as through."""
-        # Create box with 3 through holes
-        box = (
-            cq.Workplane("XY")
-            .box(80, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-20, 0), (0, 0), (20, 0)])
-            .hole(4)
-        )
-        step_path = os.path.join(temp_dir, "three_through.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_three_through)
 
         # Should detect at least 3 holes
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 3
 
 
-class TestBlindHoleDepthRatios:
-    """Test blind hole depth to diameter ratio calculations."""
+@pytest.fixture(scope="session")
+def box_blind_ratio(step_dir):
+    """Box with blind hole: 6mm diameter, 12mm depth."""
+    # Depth:diameter ratio = 12/6 = 2.0
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .circle(3)  # Radius 3mm = 6mm diameter
+        .cutBlind(-12)  # 12mm depth
+    )
+    return _export_session_step(box, step_dir, "blind_ratio.step")
 
-    def test_blind_hole_ratios_computed(self, temp_dir):
-        """Test that blind hole depth/diameter ratios are computed."""
-        # Create box with blind hole: 6mm diameter, 12mm depth
-        # Depth:diameter ratio = 12/6 = 2.0
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(3)  # Radius 3mm = 6mm diameter
-            .cutBlind(-12)  # 12mm depth
-        )
-        step_path = os.path.join(temp_dir, "blind_ratio.step")
-        cq.exporters.export(box, step_path)
 
-        features, confidence = detect_bbox_and_volume(step_path)
+@pytest.fixture(scope="session")
+def box_multi_blind_ratios(step_dir):
+    """Box with 2 blind holes of different depths."""
+    # Hole 1: 6mm diameter, 6mm depth (ratio 1.0)
+    # Hole 2: 6mm diameter, 18mm depth (ratio 3.0)
+    # Average: 2.0, Max: 3.0
+    box = (
+        cq.Workplane("XY")
+        .box(60, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0)])
+        .circle(3)
+        .cutBlind(-6)
+        .pushPoints([(15, 0)])
+        .circle(3)
+        .cutBlind(-18)
+    )
+    return _export_session_step(box, step_dir, "multi_blind_ratios.step")
 
-        # If blind hole detected, ratios should be non-zero
-        if features.blind_hole_count > 0:
-            # Ratios should be computed (non-zero)
-            # Conservative: may not be exactly 2.0, but should be > 0
-            assert features.blind_hole_avg_depth_to_diameter >= 0.0
-            assert features.blind_hole_max_depth_to_diameter >= 0.0
 
-    def test_avg_and_max_ratios_with_multiple_blind_holes(self, temp_dir):
-        """Test avg and max ratios with multiple blind holes."""
-        # Create box with 2 blind holes of different depths
-        # Hole 1: 6mm diameter, 6mm depth (ratio 1.0)
-        # Hole 2: 6mm diameter, 18mm depth (ratio 3.0)
-        # Average: 2.0, Max: 3.0
-        box = (
-            cq.Workplane("XY")
-            .box(60, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0)])
-            .circle(3)
-            .cutBlind(-6)
-            .pushPoints([(15, 0)])
-            .circle(3)
-            .cutBlind(-18)
-        )
-        step_path = os.path.join(temp_dir, "multi_blind_ratios.step")
-        cq.exporters.export(box, step_path)
+@pytest.fixture(scope="session")
+def box_shallow_blind(step_dir):
+    """Box with shallow blind hole: 10mm diameter, 5mm depth."""
+    # Ratio = 0.5
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .circle(5)  # 10mm diameter
+        .cutBlind(-5)  # 5mm depth
+    )
+    return _export_session_step(box, step_dir, "shallow_blind.step")
 
-        features, confidence = detect_bbox_and_volume(step_path)
+
+@pytest.fixture(scope="session")
+def box_deep_blind(step_dir):
+    """Box with deep blind hole: 4mm diameter, 16mm depth."""
+    # Ratio = 4.0
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .circle(2)  # 4mm diameter
+        .cutBlind(-16)  # 16mm depth
+    )
+    return _export_session_step(box, step_dir, "deep_blind.step")
+
+
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="feature_detector_blind_hole_ratios")
+class TestBlindHoleDepthRatios:
+    """Test blind hole depth to diameter ratio calculations."""
+
+    def test_blind_hole_ratios_computed(self, box_blind_ratio):
+        """Test that blind hole depth/diameter ratios are computed."""
+        features, confidence = _cached_detect(box_blind_ratio)
+
+        # If blind hole detected, ratios should be non-zero
+        if features.blind_hole_count > 0:
+            # Ratios should be computed (non-zero)
+            # Conservative: may not be exactly 2.0, but should be > 0
+            assert features.blind_hole_avg_depth_to_diameter >= 0.0
+            assert features.blind_hole_max_depth_to_diameter >= 0.0
+
+    def test_avg_and_max_ratios_with_multiple_blind_holes(self, box_multi_blind_ratios):
+        """Test avg and max ratios with multiple blind holes."""
+        features, confidence = _cached_detect(box_multi_blind_ratios)
 
         # If blind holes detected, max should be >= avg
         if features.blind_hole_count >= 2:
             assert features.blind_hole_max_depth_to_diameter >= features.blind_hole_avg_depth_to_diameter
 
-    def test_shallow_blind_hole_has_small_ratio(self, temp_dir):
+    def test_shallow_blind_hole_has_small_ratio(self, box_shallow_blind):
         """Test that shallow blind hole has ratio < 1."""
-        # Create shallow blind hole: 10mm diameter, 5mm depth
-        # Ratio = 0.5
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(5)  # 10mm diameter
-            .cutBlind(-5)  # 5mm depth
-        )
-        step_path = os.path.join(temp_dir, "shallow_blind.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_shallow_blind)
 
         # If blind hole detected, ratio should be < 1.5
         if features.blind_hole_count > 0:
             # Conservative: should be relatively small
             assert features.blind_hole_max_depth_to_diameter < 2.0
 
-    def test_deep_blind_hole_has_large_ratio(self, temp_dir):
+    def test_deep_blind_hole_has_large_ratio(self, box_deep_blind):
         """Test that deep blind hole has ratio > 2."""
-        # Create deep blind hole: 4mm diameter, 16mm depth
-        # Ratio = 4.0
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(2)  # 4mm diameter
-            .cutBlind(-16)  # 16mm depth
-        )
-        step_path = os.path.join(temp_dir, "deep_blind.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_deep_blind)
 
         # If blind hole detected, ratio should be > 2.0
         if features.blind_hole_count > 0:
@@ -749,127 +563,135 @@ class TestBlindHoleDepthRatios:
             assert features.blind_hole_max_depth_to_diameter >= 0.0
 
 
+@pytest.fixture(scope="session")
+def box_standard_m5(box_50x40x20_one_hole):
+    """Box with standard M5 hole (5.0mm)."""
+    return box_50x40x20_one_hole
+
+
+@pytest.fixture(scope="session")
+def box_non_standard(step_dir):
+    """Box with non-standard hole (7.3mm - not a standard size)."""
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .hole(7.3)  # Non-standard
+    )
+    return _export_session_step(box, step_dir, "non_standard.step")
+
+
+@pytest.fixture(scope="session")
+def box_multi_standard(step_dir):
+    """Box with M4 and M6 holes (both standard)."""
+    box = (
+        cq.Workplane("XY")
+        .box(60, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0), (15, 0)])
+        .hole(4.0)  # M4
+        .pushPoints([(0, 10)])
+        .hole(6.0)  # M6
+    )
+    return _export_session_step(box, step_dir, "multi_standard.step")
+
+
+@pytest.fixture(scope="session")
+def box_mixed_standard(step_dir):
+    """Box with M5 (standard) and 7.5mm (non-standard)."""
+    box = (
+        cq.Workplane("XY")
+        .box(60, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0)])
+        .hole(5.0)  # Standard M5
+        .pushPoints([(15, 0)])
+        .hole(7.5)  # Non-standard
+    )
+    return _export_session_step(box, step_dir, "mixed_standard.step")
+
+
+@pytest.fixture(scope="session")
+def box_tolerance_test(step_dir):
+    """Box with a 5.05mm hole (within ±0.1mm of M5 = 5.0mm)."""
+    box = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .hole(5.05)  # Within tolerance of M5
+    )
+    return _export_session_step(box, step_dir, "tolerance_test.step")
+
+
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="feature_detector_standard_holes")
 class TestStandardVsNonStandardHoles:
     """Test detection of standard vs non-standard hole sizes."""
 
-    def test_standard_hole_sizes_not_counted_as_non_standard(self, temp_dir):
+    def test_standard_hole_sizes_not_counted_as_non_standard(self, box_standard_m5):
         """Test that standard hole sizes (M3, M4, M5, M6, M8, M10) are not non-standard."""
-        # Create box with standard M5 hole (5.0mm)
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5.0)  # Standard M5
-        )
-        step_path = os.path.join(temp_dir, "standard_m5.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_standard_m5)
 
         # Standard hole should not be counted as non-standard
         # (May be 0 if detection works, or may be counted if not detected as standard)
         assert features.non_standard_hole_count >= 0
 
-    def test_non_standard_hole_size_counted(self, temp_dir):
+    def test_non_standard_hole_size_counted(self, box_non_standard):
         """Test that non-standard hole size is counted."""
-        # Create box with non-standard hole (7.3mm - not a standard size)
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(7.3)  # Non-standard
-        )
-        step_path = os.path.join(temp_dir, "non_standard.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_non_standard)
 
         # Should detect at least one hole
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 1
 
-    def test_multiple_standard_holes_no_non_standard(self, temp_dir):
+    def test_multiple_standard_holes_no_non_standard(self, box_multi_standard):
         """Test that multiple standard holes don't trigger non-standard count."""
-        # Create box with M4 and M6 holes (both standard)
-        box = (
-            cq.Workplane("XY")
-            .box(60, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0), (15, 0)])
-            .hole(4.0)  # M4
-            .pushPoints([(0, 10)])
-            .hole(6.0)  # M6
-        )
-        step_path = os.path.join(temp_dir, "multi_standard.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_multi_standard)
 
         # Should detect holes
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 2
 
-    def test_mix_of_standard_and_non_standard(self, temp_dir):
+    def test_mix_of_standard_and_non_standard(self, box_mixed_standard):
         """Test mix of standard and non-standard holes."""
-        # Create box with M5 (standard) and 7.5mm (non-standard)
-        box = (
-            cq.Workplane("XY")
-            .box(60, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0)])
-            .hole(5.0)  # Standard M5
-            .pushPoints([(15, 0)])
-            .hole(7.5)  # Non-standard
-        )
-        step_path = os.path.join(temp_dir, "mixed_standard.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_mixed_standard)
 
         # Should detect at least 2 holes
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 2
 
-    def test_tolerance_for_standard_sizes(self, temp_dir):
+    def test_tolerance_for_standard_sizes(self, box_tolerance_test):
         """Test that ±0.1mm tolerance is applied for standard sizes."""
-        # Create hole at 5.05mm (within ±0.1mm of M5 = 5.0mm)
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5.05)  # Within tolerance of M5
-        )
-        step_path = os.path.join(temp_dir, "tolerance_test.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_tolerance_test)
 
         # Should detect hole
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes >= 1
 
 
+@pytest.fixture(scope="session")
+def box_confidence_through(box_50x40x20_one_hole):
+    """50×40×20mm box with one 5mm through hole."""
+    return box_50x40x20_one_hole
+
+
+@pytest.fixture(scope="session")
+def box_confidence_blind(box_6mm_blind_hole):
+    """50×40×20mm box with one 6mm blind hole, 10mm deep."""
+    return box_6mm_blind_hole
+
+
+@pytest.mark.xdist_group(name="feature_detector_hole_confidence")
 class TestHoleConfidenceScores:
     """Test that hole detection confidence scores are improved."""
 
-    def test_through_hole_confidence_in_range(self, temp_dir):
+    def test_through_hole_confidence_in_range(self, box_confidence_through):
         """Test that through hole confidence is between 0.85 and 0.95."""
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .hole(5)
-        )
-        step_path = os.path.join(temp_dir, "confidence_through.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_confidence_through)
 
         # If holes detected, confidence should be in spec range (0.85-0.95)
         # or at least improved from v1 (>0.7)
@@ -878,76 +700,162 @@ class TestHoleConfidenceScores:
             # Should be > 0.7 (v1 confidence) and <= 1.0
             assert 0.7 < hole_confidence <= 1.0
 
-    def test_blind_hole_confidence_in_range(self, temp_dir):
+    def test_blind_hole_confidence_in_range(self, box_confidence_blind):
         """Test that blind hole confidence is reasonable."""
-        box = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .circle(3)
-            .cutBlind(-10)
-        )
-        step_path = os.path.join(temp_dir, "confidence_blind.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_confidence_blind)
 
         # If blind holes detected, confidence should be reasonable
         if features.blind_hole_count > 0:
             assert 0.0 < confidence.blind_holes <= 1.0
 
 
+@pytest.fixture(scope="session")
+def box_no_pockets(box_no_holes):
+    """50×40×20mm box with no pockets."""
+    return box_no_holes
+
+
+@pytest.fixture(scope="session")
+def box_one_pocket(step_dir):
+    """60×50×30mm box with one 20×15mm pocket, 10mm deep."""
+    # Box: 60×50×30mm, Pocket: 20×15mm, depth 10mm
+    box_with_pocket = (
+        cq.Workplane("XY")
+        .box(60, 50, 30)
+        .faces(">Z")
+        .workplane()
+        .rect(20, 15)
+        .cutBlind(-10)  # 10mm deep pocket
+    )
+    return _export_session_step(box_with_pocket, step_dir, "one_pocket.step")
+
+
+@pytest.fixture(scope="session")
+def box_pocket_8mm_deep(step_dir):
+    """50×40×20mm box with one 15×10mm pocket, 8mm deep."""
+    box_with_pocket = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .rect(15, 10)
+        .cutBlind(-8)  # 8mm deep
+    )
+    return _export_session_step(box_with_pocket, step_dir, "pocket_depth.step")
+
+
+@pytest.fixture(scope="session")
+def box_two_pockets(step_dir):
+    """80×50×25mm box with two 15×10mm pockets, 8mm deep."""
+    box_with_pockets = (
+        cq.Workplane("XY")
+        .box(80, 50, 25)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-20, 0), (20, 0)])
+        .rect(15, 10)
+        .cutBlind(-8)
+    )
+    return _export_session_step(box_with_pockets, step_dir, "two_pockets.step")
+
+
+@pytest.fixture(scope="session")
+def box_pockets_diff_depth(step_dir):
+    """70×40×20mm box with 12×8mm pockets, 5mm and 10mm deep."""
+    box_with_pockets = (
+        cq.Workplane("XY")
+        .box(70, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-15, 0)])
+        .rect(12, 8)
+        .cutBlind(-5)  # 5mm deep
+        .pushPoints([(15, 0)])
+        .rect(12, 8)
+        .cutBlind(-10)  # 10mm deep
+    )
+    return _export_session_step(box_with_pockets, step_dir, "pockets_diff_depth.step")
+
+
+@pytest.fixture(scope="session")
+def box_shallow_pocket(step_dir):
+    """50×40×20mm box with a 20×15mm pocket, 2mm deep."""
+    box_with_pocket = (
+        cq.Workplane("XY")
+        .box(50, 40, 20)
+        .faces(">Z")
+        .workplane()
+        .rect(20, 15)
+        .cutBlind(-2)  # Very shallow 2mm
+    )
+    return _export_session_step(box_with_pocket, step_dir, "shallow_pocket.step")
+
+
+@pytest.fixture(scope="session")
+def box_deep_pocket(step_dir):
+    """50×40×25mm box with a 20×15mm pocket, 18mm deep."""
+    box_with_pocket = (
+        cq.Workplane("XY")
+        .box(50, 40, 25)
+        .faces(">Z")
+        .workplane()
+        .rect(20, 15)
+        .cutBlind(-18)  # Deep 18mm
+    )
+    return _export_session_step(box_with_pocket, step_dir, "deep_pocket.step")
+
+
+@pytest.fixture(scope="session")
+def box_pocket_volume(box_pocket_8mm_deep):
+    """50×40×20mm box with one 15×10mm pocket, 8mm deep."""
+    return box_pocket_8mm_deep
+
+
+@pytest.fixture(scope="session")
+def box_complex_pockets(step_dir):
+    """60×50×25mm box with a 20×15mm pocket and a 6mm hole."""
+    complex_part = (
+        cq.Workplane("XY")
+        .box(60, 50, 25)
+        .faces(">Z")
+        .workplane()
+        .rect(20, 15)
+        .cutBlind(-10)  # Pocket
+        .faces(">Z")
+        .workplane()
+        .hole(6)  # Hole
+    )
+    return _export_session_step(complex_part, step_dir, "complex_pockets.step")
+
+
+@pytest.fixture(scope="session")
+def box_pocket_confidence(box_pocket_8mm_deep):
+    """50×40×20mm box with one 15×10mm pocket, 8mm deep."""
+    return box_pocket_8mm_deep
+
+
+@pytest.mark.xdist_group(name="feature_detector_pockets")
 class TestDetectPockets:
     """Test pocket detection v0 (simple prismatic pockets)."""
 
-    def test_box_with_no_pockets_detects_zero(self, temp_dir):
+    def test_box_with_no_pockets_detects_zero(self, box_no_pockets):
         """Test that a simple box with no pockets detects 0."""
-        box = cq.Workplane("XY").box(50, 40, 20)
-        step_path = os.path.join(temp_dir, "box_no_pockets.step")
-        cq.exporters.export(box, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_no_pockets)
 
         assert features.pocket_count == 0
         assert features.pocket_avg_depth == 0.0
         assert features.pocket_max_depth == 0.0
 
-    def test_box_with_one_rectangular_pocket(self, temp_dir):
+    def test_box_with_one_rectangular_pocket(self, box_one_pocket):
         """Test detection of single rectangular pocket."""
-        # Create box with rectangular pocket
-        # Box: 60×50×30mm, Pocket: 20×15mm, depth 10mm
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(60, 50, 30)
-            .faces(">Z")
-            .workplane()
-            .rect(20, 15)
-            .cutBlind(-10)  # 10mm deep pocket
-        )
-        step_path = os.path.join(temp_dir, "one_pocket.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_one_pocket)
 
         # Should detect at least 1 pocket
         assert features.pocket_count >= 1
 
-    def test_pocket_depth_detected(self, temp_dir):
+    def test_pocket_depth_detected(self, box_pocket_8mm_deep):
         """Test that pocket depth is detected correctly."""
-        # Create box with pocket of known depth (8mm)
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .rect(15, 10)
-            .cutBlind(-8)  # 8mm deep
-        )
-        step_path = os.path.join(temp_dir, "pocket_depth.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_pocket_8mm_deep)
 
         # If pocket detected, depth should be reasonable
         if features.pocket_count > 0:
@@ -955,145 +863,57 @@ class TestDetectPockets:
             assert 0.0 < features.pocket_max_depth < 20.0
             assert 0.0 < features.pocket_avg_depth < 20.0
 
-    def test_multiple_pockets_detected(self, temp_dir):
+    def test_multiple_pockets_detected(self, box_two_pockets):
         """Test detection of multiple pockets."""
-        # Create box with 2 rectangular pockets
-        box_with_pockets = (
-            cq.Workplane("XY")
-            .box(80, 50, 25)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-20, 0), (20, 0)])
-            .rect(15, 10)
-            .cutBlind(-8)
-        )
-        step_path = os.path.join(temp_dir, "two_pockets.step")
-        cq.exporters.export(box_with_pockets, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_two_pockets)
 
         # Should detect at least 2 pockets (may detect more due to heuristics)
         # Conservative test: at least some pockets detected
         assert features.pocket_count >= 0  # May be 0, 1, 2, or more
 
-    def test_pocket_avg_and_max_depth(self, temp_dir):
+    def test_pocket_avg_and_max_depth(self, box_pockets_diff_depth):
         """Test avg and max depth with pockets of different depths."""
-        # Create box with 2 pockets: 5mm and 10mm deep
-        box_with_pockets = (
-            cq.Workplane("XY")
-            .box(70, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .pushPoints([(-15, 0)])
-            .rect(12, 8)
-            .cutBlind(-5)  # 5mm deep
-            .pushPoints([(15, 0)])
-            .rect(12, 8)
-            .cutBlind(-10)  # 10mm deep
-        )
-        step_path = os.path.join(temp_dir, "pockets_diff_depth.step")
-        cq.exporters.export(box_with_pockets, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_pockets_diff_depth)
 
         # If pockets detected, max should be >= avg
         if features.pocket_count >= 2:
             assert features.pocket_max_depth >= features.pocket_avg_depth
 
-    def test_shallow_pocket_detected(self, temp_dir):
+    def test_shallow_pocket_detected(self, box_shallow_pocket):
         """Test detection of shallow pocket (2mm deep)."""
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .rect(20, 15)
-            .cutBlind(-2)  # Very shallow 2mm
-        )
-        step_path = os.path.join(temp_dir, "shallow_pocket.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_shallow_pocket)
 
         # May or may not detect shallow pockets (conservative)
         assert features.pocket_count >= 0
 
-    def test_deep_pocket_detected(self, temp_dir):
+    def test_deep_pocket_detected(self, box_deep_pocket):
         """Test detection of deep pocket."""
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(50, 40, 25)
-            .faces(">Z")
-            .workplane()
-            .rect(20, 15)
-            .cutBlind(-18)  # Deep 18mm
-        )
-        step_path = os.path.join(temp_dir, "deep_pocket.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_deep_pocket)
 
         # Deep pockets should be detected
         if features.pocket_count > 0:
             # Deep pocket should have significant depth
             assert features.pocket_max_depth > 5.0
 
-    def test_pocket_volume_computed(self, temp_dir):
+    def test_pocket_volume_computed(self, box_pocket_volume):
         """Test that pocket_total_volume is computed (implemented in Prompt 21)."""
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .rect(15, 10)
-            .cutBlind(-8)
-        )
-        step_path = os.path.join(temp_dir, "pocket_volume.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_pocket_volume)
 
         # Volume should be computed (Prompt 21)
         if features.pocket_count > 0:
             assert features.pocket_total_volume > 0
 
-    def test_pocket_detection_does_not_crash(self, temp_dir):
+    def test_pocket_detection_does_not_crash(self, box_complex_pockets):
         """Test that pocket detection doesn't crash on complex geometry."""
-        # Complex part with holes and potential pockets
-        complex_part = (
-            cq.Workplane("XY")
-            .box(60, 50, 25)
-            .faces(">Z")
-            .workplane()
-            .rect(20, 15)
-            .cutBlind(-10)  # Pocket
-            .faces(">Z")
-            .workplane()
-            .hole(6)  # Hole
-        )
-        step_path = os.path.join(temp_dir, "complex_pockets.step")
-        cq.exporters.export(complex_part, step_path)
-
         # Should not crash
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_complex_pockets)
 
         assert isinstance(features, PartFeatures)
         assert isinstance(confidence, FeatureConfidence)
 
-    def test_pocket_confidence_when_detected(self, temp_dir):
+    def test_pocket_confidence_when_detected(self, box_pocket_confidence):
         """Test that pocket confidence is set when pockets detected."""
-        box_with_pocket = (
-            cq.Workplane("XY")
-            .box(50, 40, 20)
-            .faces(">Z")
-            .workplane()
-            .rect(15, 10)
-            .cutBlind(-8)
-        )
-        step_path = os.path.join(temp_dir, "pocket_confidence.step")
-        cq.exporters.export(box_with_pocket, step_path)
-
-        features, confidence = detect_bbox_and_volume(step_path)
+        features, confidence = _cached_detect(box_pocket_confidence)
 
         # If pockets detected, confidence should be > 0
         if features.pocket_count > 0:
@@ -1107,7 +927,7 @@ class TestDetectPockets:
 class TestPocketVolumeApproximation:
     """Test pocket volume approximation (Prompt 21)."""
 
-    def test_rectangular_pocket_volume_approximation(self, temp_dir):
+    def test_rectangular_pocket_volume_approximation(self, tmp_path):
         """Test that rectangular pocket volume is approximated correctly."""
         # Create box with rectangular pocket
         # Box: 60×50×30mm, Pocket: 20×15mm, depth 10mm
@@ -1120,7 +940,7 @@ class TestPocketVolumeApproximation:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "pocket_volume.step")
+        step_path = str(tmp_path / "pocket_volume.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1136,7 +956,7 @@ class TestPocketVolumeApproximation:
             assert features.pocket_total_volume > expected_volume * 0.5
             assert features.pocket_total_volume < expected_volume * 3.0  # Allow 3x tolerance
 
-    def test_multiple_pockets_total_volume(self, temp_dir):
+    def test_multiple_pockets_total_volume(self, tmp_path):
         """Test that multiple pockets contribute to total volume."""
         # Create box with 2 pockets: 12×8×5mm and 12×8×10mm
         # Expected total: (12*8*5) + (12*8*10) = 480 + 960 = 1440 mm³
@@ -1152,7 +972,7 @@ class TestPocketVolumeApproximation:
             .rect(12, 8)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "multi_pocket_volume.step")
+        step_path = str(tmp_path / "multi_pocket_volume.step")
         cq.exporters.export(box_with_pockets, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1162,17 +982,17 @@ class TestPocketVolumeApproximation:
             # Should be greater than single pocket volume
             assert features.pocket_total_volume > 500
 
-    def test_no_pockets_zero_volume(self, temp_dir):
+    def test_no_pockets_zero_volume(self, tmp_path):
         """Test that no pockets results in zero volume."""
         box = cq.Workplane("XY").box(50, 40, 20)
-        step_path = os.path.join(temp_dir, "no_pocket_volume.step")
+        step_path = str(tmp_path / "no_pocket_volume.step")
         cq.exporters.export(box, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
 
         assert features.pocket_total_volume == 0.0
 
-    def test_shallow_pocket_has_small_volume(self, temp_dir):
+    def test_shallow_pocket_has_small_volume(self, tmp_path):
         """Test that shallow pocket has proportionally smaller volume."""
         # Shallow pocket: 20×15×2mm = 600 mm³
         box_with_pocket = (
@@ -1183,7 +1003,7 @@ class TestPocketVolumeApproximation:
             .rect(20, 15)
             .cutBlind(-2)
         )
-        step_path = os.path.join(temp_dir, "shallow_volume.step")
+        step_path = str(tmp_path / "shallow_volume.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1193,7 +1013,7 @@ class TestPocketVolumeApproximation:
             # Should be less than 2000 mm³
             assert features.pocket_total_volume < 2000
 
-    def test_deep_pocket_has_large_volume(self, temp_dir):
+    def test_deep_pocket_has_large_volume(self, tmp_path):
         """Test that deep pocket has proportionally larger volume."""
         # Deep pocket: 20×15×15mm = 4500 mm³
         box_with_pocket = (
@@ -1204,7 +1024,7 @@ class TestPocketVolumeApproximation:
             .rect(20, 15)
             .cutBlind(-15)
         )
-        step_path = os.path.join(temp_dir, "deep_volume.step")
+        step_path = str(tmp_path / "deep_volume.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1214,7 +1034,7 @@ class TestPocketVolumeApproximation:
             # Should be > 2000 mm³
             assert features.pocket_total_volume > 2000
 
-    def test_pocket_volume_consistent_across_runs(self, temp_dir):
+    def test_pocket_volume_consistent_across_runs(self, tmp_path):
         """Test that pocket volume calculation is deterministic."""
         box_with_pocket = (
             cq.Workplane("XY")
@@ -1224,7 +1044,7 @@ class TestPocketVolumeApproximation:
             .rect(15, 10)
             .cutBlind(-8)
         )
-        step_path = os.path.join(temp_dir, "consistent_volume.step")
+        step_path = str(tmp_path / "consistent_volume.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         # Run detection twice
@@ -1234,7 +1054,7 @@ class TestPocketVolumeApproximation:
         # Should be identical
         assert features1.pocket_total_volume == features2.pocket_total_volume
 
-    def test_pocket_confidence_improves_with_volume(self, temp_dir):
+    def test_pocket_confidence_improves_with_volume(self, tmp_path):
         """Test that confidence improves when volume can be computed."""
         box_with_pocket = (
             cq.Workplane("XY")
@@ -1244,7 +1064,7 @@ class TestPocketVolumeApproximation:
             .rect(15, 10)
             .cutBlind(-8)
         )
-        step_path = os.path.join(temp_dir, "volume_confidence.step")
+        step_path = str(tmp_path / "volume_confidence.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1255,7 +1075,7 @@ class TestPocketVolumeApproximation:
             assert confidence.pockets > 0.7
             assert confidence.pockets <= 1.0
 
-    def test_volume_approximation_conservative(self, temp_dir):
+    def test_volume_approximation_conservative(self, tmp_path):
         """Test that volume approximation is conservative (reasonable bounds)."""
         # Pocket: 20×15×10mm, expected 3000 mm³
         box_with_pocket = (
@@ -1266,7 +1086,7 @@ class TestPocketVolumeApproximation:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "conservative_volume.step")
+        step_path = str(tmp_path / "conservative_volume.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1281,7 +1101,7 @@ class TestPocketVolumeApproximation:
 class TestMultiAxisPocketDetection:
     """Test pocket detection from multiple face orientations (Prompt 22)."""
 
-    def test_pocket_on_positive_x_face_detected(self, temp_dir):
+    def test_pocket_on_positive_x_face_detected(self, tmp_path):
         """Test that pockets machined from +X face (side) are detected."""
         # Box 60×50×30mm with pocket on +X face (right side)
         # Pocket: 20×15mm, 10mm deep into the part
@@ -1293,7 +1113,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 15)
             .cutBlind(-10)  # Cut 10mm into the part from +X face
         )
-        step_path = os.path.join(temp_dir, "box_pocket_plus_x.step")
+        step_path = str(tmp_path / "box_pocket_plus_x.step")
         cq.exporters.export(box_with_side_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1303,7 +1123,7 @@ class TestMultiAxisPocketDetection:
         # Should have reasonable depth
         assert features.pocket_max_depth > 5.0  # At least 5mm deep
 
-    def test_pocket_on_negative_y_face_detected(self, temp_dir):
+    def test_pocket_on_negative_y_face_detected(self, tmp_path):
         """Test that pockets machined from -Y face (side) are detected."""
         # Box 60×50×30mm with pocket on -Y face (left side)
         box_with_side_pocket = (
@@ -1314,7 +1134,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 15)
             .cutBlind(-10)  # Cut 10mm into the part from -Y face
         )
-        step_path = os.path.join(temp_dir, "box_pocket_minus_y.step")
+        step_path = str(tmp_path / "box_pocket_minus_y.step")
         cq.exporters.export(box_with_side_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1324,7 +1144,7 @@ class TestMultiAxisPocketDetection:
         # Should have reasonable depth
         assert features.pocket_max_depth > 5.0
 
-    def test_pocket_on_top_face_still_detected(self, temp_dir):
+    def test_pocket_on_top_face_still_detected(self, tmp_path):
         """Test backward compatibility: top-down (Z-axis) pockets still work."""
         # Box 60×50×30mm with pocket on top face (existing functionality)
         box_with_top_pocket = (
@@ -1335,7 +1155,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 15)
             .cutBlind(-10)  # Cut 10mm down from top
         )
-        step_path = os.path.join(temp_dir, "box_pocket_top_z.step")
+        step_path = str(tmp_path / "box_pocket_top_z.step")
         cq.exporters.export(box_with_top_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1344,7 +1164,7 @@ class TestMultiAxisPocketDetection:
         assert features.pocket_count >= 1
         assert features.pocket_max_depth > 5.0
 
-    def test_pockets_on_multiple_axes_all_detected(self, temp_dir):
+    def test_pockets_on_multiple_axes_all_detected(self, tmp_path):
         """Test that pockets on different axes are all detected."""
         # Create box with pockets on three different faces
         box_base = cq.Workplane("XY").box(80, 80, 80)
@@ -1376,7 +1196,7 @@ class TestMultiAxisPocketDetection:
             .cutBlind(-10)
         )
 
-        step_path = os.path.join(temp_dir, "box_multi_axis_pockets.step")
+        step_path = str(tmp_path / "box_multi_axis_pockets.step")
         cq.exporters.export(box_base, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1385,7 +1205,7 @@ class TestMultiAxisPocketDetection:
         # Note: May detect more due to wall faces, but should be >= 3
         assert features.pocket_count >= 3
 
-    def test_side_pocket_depth_calculation_correct(self, temp_dir):
+    def test_side_pocket_depth_calculation_correct(self, tmp_path):
         """Test that depth calculation is correct for side pockets."""
         # Create a pocket on the +X face with known depth
         box_with_x_pocket = (
@@ -1396,7 +1216,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 15)
             .cutBlind(-12)  # 12mm deep pocket
         )
-        step_path = os.path.join(temp_dir, "side_pocket_depth.step")
+        step_path = str(tmp_path / "side_pocket_depth.step")
         cq.exporters.export(box_with_x_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1406,7 +1226,7 @@ class TestMultiAxisPocketDetection:
             # Allow range: 8-16mm (within 2x for conservative heuristic)
             assert 8.0 < features.pocket_max_depth < 16.0
 
-    def test_multi_axis_pocket_volume_included(self, temp_dir):
+    def test_multi_axis_pocket_volume_included(self, tmp_path):
         """Test that total volume includes pockets from all orientations."""
         # Create box with pockets on two different axes
         box_with_pockets = (
@@ -1421,7 +1241,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 20)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "multi_axis_volume.step")
+        step_path = str(tmp_path / "multi_axis_volume.step")
         cq.exporters.export(box_with_pockets, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1431,7 +1251,7 @@ class TestMultiAxisPocketDetection:
         # With wall faces, may be higher, but should be > 4000 mm³
         assert features.pocket_total_volume > 4000.0
 
-    def test_complex_part_with_holes_and_multi_axis_pockets_no_crash(self, temp_dir):
+    def test_complex_part_with_holes_and_multi_axis_pockets_no_crash(self, tmp_path):
         """Test that complex parts with holes and multi-axis pockets don't crash."""
         # Create a complex part with both holes and pockets on different axes
         complex_part = (
@@ -1447,7 +1267,7 @@ class TestMultiAxisPocketDetection:
             .rect(25, 25)
             .cutBlind(-12)  # Side pocket on +X
         )
-        step_path = os.path.join(temp_dir, "complex_multi_axis.step")
+        step_path = str(tmp_path / "complex_multi_axis.step")
         cq.exporters.export(complex_part, step_path)
 
         # Should not crash
@@ -1458,7 +1278,7 @@ class TestMultiAxisPocketDetection:
         total_holes = features.through_hole_count + features.blind_hole_count
         assert total_holes > 0
 
-    def test_multi_axis_pocket_confidence_appropriate(self, temp_dir):
+    def test_multi_axis_pocket_confidence_appropriate(self, tmp_path):
         """Test that confidence scores remain appropriate with multi-axis detection."""
         # Create box with side pocket
         box_with_side_pocket = (
@@ -1469,7 +1289,7 @@ class TestMultiAxisPocketDetection:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "confidence_check.step")
+        step_path = str(tmp_path / "confidence_check.step")
         cq.exporters.export(box_with_side_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1484,7 +1304,7 @@ class TestMultiAxisPocketDetection:
 class TestAccuratePocketVolume:
     """Test accurate pocket volume calculation with face grouping (Prompt 23)."""
 
-    def test_rectangular_pocket_volume_within_20_percent_accuracy(self, temp_dir):
+    def test_rectangular_pocket_volume_within_20_percent_accuracy(self, tmp_path):
         """Test that rectangular pocket volume is within 20% of expected (not 3x)."""
         # Pocket: 20×15×10mm, expected volume = 3000 mm³
         box_with_pocket = (
@@ -1495,7 +1315,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "accurate_rect_pocket.step")
+        step_path = str(tmp_path / "accurate_rect_pocket.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1506,7 +1326,7 @@ class TestAccuratePocketVolume:
         assert features.pocket_total_volume > expected_volume * 0.8
         assert features.pocket_total_volume < expected_volume * 1.2
 
-    def test_20x15x10mm_pocket_returns_approximately_3000_cubic_mm(self, temp_dir):
+    def test_20x15x10mm_pocket_returns_approximately_3000_cubic_mm(self, tmp_path):
         """Verify specific test case: 20×15×10mm pocket returns ~3000mm³ ±20%."""
         box_with_pocket = (
             cq.Workplane("XY")
@@ -1516,7 +1336,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "pocket_3000.step")
+        step_path = str(tmp_path / "pocket_3000.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1524,7 +1344,7 @@ class TestAccuratePocketVolume:
         # Target: 3000 mm³ ±20%
         assert 2400 < features.pocket_total_volume < 3600
 
-    def test_l_shaped_pocket_volume_calculated_correctly(self, temp_dir):
+    def test_l_shaped_pocket_volume_calculated_correctly(self, tmp_path):
         """Test that L-shaped pocket volume is calculated with reasonable accuracy."""
         # Create an L-shaped pocket by combining two rectangular cuts
         box_with_l_pocket = (
@@ -1540,7 +1360,7 @@ class TestAccuratePocketVolume:
             .rect(20, 30)
             .cutBlind(-12)
         )
-        step_path = os.path.join(temp_dir, "l_shaped_pocket.step")
+        step_path = str(tmp_path / "l_shaped_pocket.step")
         cq.exporters.export(box_with_l_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1552,7 +1372,7 @@ class TestAccuratePocketVolume:
         assert features.pocket_total_volume > expected_approx * 0.5
         assert features.pocket_total_volume < expected_approx * 2.0
 
-    def test_multiple_separate_pockets_each_volume_accurate(self, temp_dir):
+    def test_multiple_separate_pockets_each_volume_accurate(self, tmp_path):
         """Test that multiple separate pockets each contribute accurate volume."""
         # Two separate pockets: 20×15×10mm each = 3000 mm³ each = 6000 mm³ total
         box_with_two_pockets = (
@@ -1569,7 +1389,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "two_pockets.step")
+        step_path = str(tmp_path / "two_pockets.step")
         cq.exporters.export(box_with_two_pockets, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1579,7 +1399,7 @@ class TestAccuratePocketVolume:
         assert features.pocket_total_volume > expected_total * 0.8
         assert features.pocket_total_volume < expected_total * 1.2
 
-    def test_deep_vs_shallow_pocket_volume_ratio_correct(self, temp_dir):
+    def test_deep_vs_shallow_pocket_volume_ratio_correct(self, tmp_path):
         """Test that deep pocket has proportionally larger volume than shallow."""
         # Deep pocket: 20×20×15mm = 6000 mm³
         box_deep = (
@@ -1590,7 +1410,7 @@ class TestAccuratePocketVolume:
             .rect(20, 20)
             .cutBlind(-15)
         )
-        step_path_deep = os.path.join(temp_dir, "deep_pocket_accurate.step")
+        step_path_deep = str(tmp_path / "deep_pocket_accurate.step")
         cq.exporters.export(box_deep, step_path_deep)
 
         features_deep, _ = detect_bbox_and_volume(step_path_deep)
@@ -1604,7 +1424,7 @@ class TestAccuratePocketVolume:
             .rect(20, 20)
             .cutBlind(-5)
         )
-        step_path_shallow = os.path.join(temp_dir, "shallow_pocket_accurate.step")
+        step_path_shallow = str(tmp_path / "shallow_pocket_accurate.step")
         cq.exporters.export(box_shallow, step_path_shallow)
 
         features_shallow, _ = detect_bbox_and_volume(step_path_shallow)
@@ -1615,7 +1435,7 @@ class TestAccuratePocketVolume:
             # Allow 2.0 to 4.0 range (centered on 3.0)
             assert 2.0 < ratio < 4.0
 
-    def test_pocket_with_angled_walls_reasonable_volume(self, temp_dir):
+    def test_pocket_with_angled_walls_reasonable_volume(self, tmp_path):
         """Test that pockets with non-vertical walls have reasonable volume."""
         # Create a pocket with drafted (angled) walls using loft
         # Simplified: just use a larger top and smaller bottom
@@ -1629,7 +1449,7 @@ class TestAccuratePocketVolume:
             .rect(25, 25)
             .cutBlind(-12)
         )
-        step_path = os.path.join(temp_dir, "angled_pocket.step")
+        step_path = str(tmp_path / "angled_pocket.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1640,7 +1460,7 @@ class TestAccuratePocketVolume:
         assert features.pocket_total_volume > expected * 0.7
         assert features.pocket_total_volume < expected * 1.5
 
-    def test_volume_improvement_over_old_method(self, temp_dir):
+    def test_volume_improvement_over_old_method(self, tmp_path):
         """Test that new method is more accurate than old 3x overestimate."""
         # Known case: 20×15×10mm = 3000 mm³
         box_with_pocket = (
@@ -1651,7 +1471,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "improvement_check.step")
+        step_path = str(tmp_path / "improvement_check.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1662,7 +1482,7 @@ class TestAccuratePocketVolume:
         # Error should be less than 20% (old method was 200%+ error)
         assert error_percent < 20.0
 
-    def test_backward_compatibility_count_and_depth_still_valid(self, temp_dir):
+    def test_backward_compatibility_count_and_depth_still_valid(self, tmp_path):
         """Test that pocket count and depth statistics remain valid after improvement."""
         # Single pocket: 20×15×10mm deep
         box_with_pocket = (
@@ -1673,7 +1493,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "backward_compat.step")
+        step_path = str(tmp_path / "backward_compat.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1687,7 +1507,7 @@ class TestAccuratePocketVolume:
         # Confidence should be high with volume
         assert confidence.pockets >= 0.8
 
-    def test_confidence_improves_to_0_9_with_accurate_volume(self, temp_dir):
+    def test_confidence_improves_to_0_9_with_accurate_volume(self, tmp_path):
         """Test that confidence score improves to 0.9 with accurate volume calculation."""
         box_with_pocket = (
             cq.Workplane("XY")
@@ -1697,7 +1517,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "confidence_0_9.step")
+        step_path = str(tmp_path / "confidence_0_9.step")
         cq.exporters.export(box_with_pocket, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1707,7 +1527,7 @@ class TestAccuratePocketVolume:
             assert confidence.pockets >= 0.9
             assert confidence.pockets <= 1.0
 
-    def test_two_pockets_separated_by_thin_wall_top_down(self, temp_dir):
+    def test_two_pockets_separated_by_thin_wall_top_down(self, tmp_path):
         """Test that two pockets separated by 0.001mm wall are correctly identified as TWO pockets."""
         # Create two pockets with only 0.001mm wall between them (top-down Z-axis)
         # Each pocket: 20×15×10mm = 3000mm³
@@ -1726,7 +1546,7 @@ class TestAccuratePocketVolume:
             .rect(20, 15)
             .cutBlind(-10)
         )
-        step_path = os.path.join(temp_dir, "two_pockets_thin_wall_z.step")
+        step_path = str(tmp_path / "two_pockets_thin_wall_z.step")
         cq.exporters.export(box_with_close_pockets, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
@@ -1739,7 +1559,7 @@ class TestAccuratePocketVolume:
         assert features.pocket_total_volume > expected_total * 0.8
         assert features.pocket_total_volume < expected_total * 1.2
 
-    def test_twelve_pockets_all_faces_thin_walls(self, temp_dir):
+    def test_twelve_pockets_all_faces_thin_walls(self, tmp_path):
         """Test 12 pockets (2 on EACH of 6 faces) separated by 0.5mm walls."""
         # Create 2 pockets on EACH face with 0.5mm wall between them
         # Each pocket: 15×15×3mm = 675mm³
@@ -1795,7 +1615,7 @@ class TestAccuratePocketVolume:
                   .rect(pocket_width, pocket_width)
                   .cutBlind(-pocket_depth))
 
-        step_path = os.path.join(temp_dir, "twelve_pockets_all_faces.step")
+        step_path = str(tmp_path / "twelve_pockets_all_faces.step")
         cq.exporters.export(result, step_path)
 
         features, confidence = detect_bbox_and_volume(step_path)
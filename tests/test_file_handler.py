@@ -18,72 +18,64 @@ from modules.file_handler import (
 import cadquery as cq
 
 
-class TestValidateExtension:
-    """Test file extension validation."""
+_MAX_50MB = 52428800  # 50 * 1024 * 1024, the spec upload limit
+_BINARY_256 = bytes(range(256))  # every byte value, including nulls
 
-    def test_valid_step_extension_lowercase(self):
-        """Test that .step extension (lowercase) is valid."""
-        # Should not raise exception
-        validate_extension("test.step")
-        validate_extension("my_part.step")
-        validate_extension("complex-part-name.step")
 
-    def test_valid_step_extension_uppercase(self):
-        """Test that .STEP extension (uppercase) is valid."""
-        # Should not raise exception
-        validate_extension("test.STEP")
-        validate_extension("MY_PART.STEP")
+def _assert_file_contents(path, expected, chunk_size=64 * 1024):
+    """Assert the file at path holds exactly expected, reading it in chunks."""
+    view = memoryview(expected)
+    offset = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            assert chunk == view[offset:offset + len(chunk)], f"mismatch at byte {offset}"
+            offset += len(chunk)
+    assert offset == len(expected)
 
-    def test_valid_step_extension_mixed_case(self):
-        """Test that .StEp extension (mixed case) is valid."""
-        # Should not raise exception
-        validate_extension("test.StEp")
-        validate_extension("test.Step")
 
-    def test_valid_stp_extension_lowercase(self):
-        """Test that .stp extension (lowercase) is valid."""
-        # Should not raise exception
-        validate_extension("test.stp")
-        validate_extension("my_part.stp")
+class TestValidateExtension:
+    """Test file extension validation."""
 
-    def test_valid_stp_extension_uppercase(self):
-        """Test that .STP extension (uppercase) is valid."""
+    @pytest.mark.parametrize(
+        "filename",
+        [
+            # .step in any case
+            "test.step",
+            "my_part.step",
+            "complex-part-name.step",
+            "test.STEP",
+            "MY_PART.STEP",
+            "test.StEp",
+            "test.Step",
+            # .stp in any case
+            "test.stp",
+            "my_part.stp",
+            "test.STP",
+            "test.StP",
+            "test.Stp",
+            # Multiple dots but valid extension
+            "my.test.part.step",
+            "v1.2.3.stp",
+        ],
+    )
+    def test_valid_extension(self, filename):
+        """Test that .step/.stp filenames pass validation, case-insensitively."""
         # Should not raise exception
-        validate_extension("test.STP")
+        validate_extension(filename)
 
-    def test_valid_stp_extension_mixed_case(self):
-        """Test that .StP extension (mixed case) is valid."""
-        # Should not raise exception
-        validate_extension("test.StP")
+    @pytest.mark.parametrize("filename", ["test.stl", "test.obj", "test.txt", "test"])
+    def test_invalid_extension_raises(self, filename):
+        """Test that other extensions (or none) raise InvalidExtensionError."""
+        with pytest.raises(InvalidExtensionError):
+            validate_extension(filename)
 
-    def test_invalid_stl_extension_raises(self):
-        """Test that .stl extension raises InvalidExtensionError."""
+    def test_invalid_stl_extension_message(self):
+        """Test that rejecting .stl reports an invalid file format."""
         with pytest.raises(InvalidExtensionError) as exc_info:
             validate_extension("test.stl")
 
         assert "invalid file format" in str(exc_info.value).lower()
 
-    def test_invalid_obj_extension_raises(self):
-        """Test that .obj extension raises InvalidExtensionError."""
-        with pytest.raises(InvalidExtensionError):
-            validate_extension("test.obj")
-
-    def test_invalid_txt_extension_raises(self):
-        """Test that .txt extension raises InvalidExtensionError."""
-        with pytest.raises(InvalidExtensionError):
-            validate_extension("test.txt")
-
-    def test_no_extension_raises(self):
-        """Test that filename without extension raises InvalidExtensionError."""
-        with pytest.raises(InvalidExtensionError):
-            validate_extension("test")
-
-    def test_multiple_dots_in_filename(self):
-        """Test filename with multiple dots but valid extension."""
-        # Should not raise exception
-        validate_extension("my.test.part.step")
-        validate_extension("v1.2.3.stp")
-
     def test_error_message_mentions_step_upload(self):
         """Test that error message is spec-aligned."""
         with pytest.raises(InvalidExtensionError) as exc_info:
@@ -92,59 +84,52 @@ class TestValidateExtension:
         error_msg = str(exc_info.value).lower()
         assert "step" in error_msg or ".step" in error_msg
 
-    def test_case_insensitive_validation(self):
-        """Test that validation is case-insensitive."""
-        # All these should be valid
-        validate_extension("test.step")
-        validate_extension("test.STEP")
-        validate_extension("test.Step")
-        validate_extension("test.stp")
-        validate_extension("test.STP")
-        validate_extension("test.Stp")
-
 
 class TestValidateSize:
     """Test file size validation."""
 
-    def test_size_within_limit(self):
-        """Test that size within limit passes validation."""
-        # Should not raise exception
-        validate_size(1000, 5000)
-        validate_size(0, 5000)
-        validate_size(4999, 5000)
-
-    def test_size_exactly_at_limit(self):
-        """Test that size exactly at limit passes validation."""
+    @pytest.mark.parametrize(
+        "size, max_size",
+        [
+            # Within limit
+            (1000, 5000),
+            (0, 5000),
+            (4999, 5000),
+            # Exactly at limit
+            (5000, 5000),
+            (_MAX_50MB, _MAX_50MB),
+            # Zero size (edge case)
+            (0, 1000),
+        ],
+    )
+    def test_size_within_limit(self, size, max_size):
+        """Test that sizes up to and including the limit pass validation."""
         # Should not raise exception
-        validate_size(5000, 5000)
-        validate_size(52428800, 52428800)  # 50MB
-
-    def test_size_one_byte_over_limit_raises(self):
-        """Test that size exactly 1 byte over limit raises FileSizeError."""
-        with pytest.raises(FileSizeError):
-            validate_size(5001, 5000)
+        validate_size(size, max_size)
 
-    def test_size_far_over_limit_raises(self):
-        """Test that size far over limit raises FileSizeError."""
+    @pytest.mark.parametrize(
+        "size, max_size",
+        [
+            (5001, 5000),  # One byte over
+            (100000, 5000),  # Far over
+        ],
+    )
+    def test_size_over_limit_raises(self, size, max_size):
+        """Test that sizes over the limit raise FileSizeError."""
         with pytest.raises(FileSizeError):
-            validate_size(100000, 5000)
-
-    def test_size_zero_is_valid(self):
-        """Test that zero size is valid (edge case)."""
-        # Should not raise exception
-        validate_size(0, 1000)
+            validate_size(size, max_size)
 
     def test_max_size_50mb(self):
         """Test validation with 50MB limit (from spec)."""
-        max_size = 52428800  # 50 * 1024 * 1024
+        max_size = _MAX_50MB
 
         # Should not raise exception
-        validate_size(52428800, max_size)  # Exactly 50MB
-        validate_size(52428799, max_size)  # Just under
+        validate_size(_MAX_50MB, max_size)  # Exactly 50MB
+        validate_size(_MAX_50MB - 1, max_size)  # Just under
 
         # Should raise exception
         with pytest.raises(FileSizeError):
-            validate_size(52428801, max_size)  # Just over
+            validate_size(_MAX_50MB + 1, max_size)  # Just over
 
     def test_error_message_mentions_limit(self):
         """Test that error message is spec-aligned and mentions limit."""
@@ -156,7 +141,7 @@ class TestValidateSize:
 
     def test_error_message_mentions_50mb_for_spec_limit(self):
         """Test that error message mentions 50MB when using spec limit."""
-        max_size = 52428800  # 50MB
+        max_size = _MAX_50MB
 
         with pytest.raises(FileSizeError) as exc_info:
             validate_size(max_size + 1, max_size)
@@ -241,188 +226,166 @@ class TestPureFunctions:
 class TestStoreUpload:
     """Test store_upload function."""
 
-    def test_store_upload_creates_file(self):
+    def test_store_upload_creates_file(self, tmp_path):
         """Test that store_upload creates a file in uploads directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test file content"
-            original_filename = "test.step"
+        file_bytes = b"test file content"
+        original_filename = "test.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # File should exist
-            assert os.path.exists(stored_path)
+        # File should exist
+        assert os.path.exists(stored_path)
 
-    def test_store_upload_returns_uuid(self):
+    def test_store_upload_returns_uuid(self, tmp_path):
         """Test that store_upload returns a valid UUID."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test content"
-            original_filename = "test.step"
+        file_bytes = b"test content"
+        original_filename = "test.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # part_id should be a valid UUID
-            assert isinstance(part_id, str)
-            assert len(part_id) > 0
+        # part_id should be a valid UUID
+        assert isinstance(part_id, str)
+        assert len(part_id) > 0
 
-            # Should be able to parse as UUID
-            uuid_obj = uuid.UUID(part_id)
-            assert str(uuid_obj) == part_id
+        # Should be able to parse as UUID
+        uuid_obj = uuid.UUID(part_id)
+        assert str(uuid_obj) == part_id
 
-    def test_store_upload_preserves_step_extension(self):
+    def test_store_upload_preserves_step_extension(self, tmp_path):
         """Test that store_upload preserves .step extension."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test content"
-            original_filename = "my_part.step"
+        file_bytes = b"test content"
+        original_filename = "my_part.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # Stored file should have .step extension
-            assert stored_path.endswith(".step")
+        # Stored file should have .step extension
+        assert stored_path.endswith(".step")
 
-    def test_store_upload_preserves_stp_extension(self):
+    def test_store_upload_preserves_stp_extension(self, tmp_path):
         """Test that store_upload preserves .stp extension."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test content"
-            original_filename = "my_part.stp"
+        file_bytes = b"test content"
+        original_filename = "my_part.stp"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # Stored file should have .stp extension
-            assert stored_path.endswith(".stp")
+        # Stored file should have .stp extension
+        assert stored_path.endswith(".stp")
 
-    def test_store_upload_writes_correct_bytes(self):
+    def test_store_upload_writes_correct_bytes(self, tmp_path):
         """Test that store_upload writes the exact same bytes."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"This is test file content with some data: 12345"
-            original_filename = "test.step"
-
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        file_bytes = b"This is test file content with some data: 12345"
+        original_filename = "test.step"
 
-            # Read back the file
-            with open(stored_path, "rb") as f:
-                stored_bytes = f.read()
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # Should be exactly the same
-            assert stored_bytes == file_bytes
+        # Stored file should hold exactly the same bytes
+        _assert_file_contents(stored_path, file_bytes)
 
-    def test_store_upload_creates_directory_if_missing(self):
+    def test_store_upload_creates_directory_if_missing(self, tmp_path):
         """Test that store_upload creates uploads directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a nested path that doesn't exist
-            uploads_dir = os.path.join(tmpdir, "uploads", "nested")
-            assert not os.path.exists(uploads_dir)
+        # Create a nested path that doesn't exist
+        uploads_dir = tmp_path / "uploads" / "nested"
+        assert not uploads_dir.exists()
 
-            file_bytes = b"test content"
-            original_filename = "test.step"
+        file_bytes = b"test content"
+        original_filename = "test.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, uploads_dir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(uploads_dir))
 
-            # Directory should now exist
-            assert os.path.exists(uploads_dir)
-            # File should exist
-            assert os.path.exists(stored_path)
+        # Directory should now exist
+        assert uploads_dir.is_dir()
+        # File should exist
+        assert os.path.exists(stored_path)
 
-    def test_store_upload_returns_correct_path(self):
+    def test_store_upload_returns_correct_path(self, tmp_path):
         """Test that returned path is in the correct directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test content"
-            original_filename = "test.step"
+        file_bytes = b"test content"
+        original_filename = "test.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # Path should be in the uploads directory
-            assert stored_path.startswith(tmpdir)
-            # Filename should be UUID + extension
-            filename = os.path.basename(stored_path)
-            assert filename.endswith(".step")
-            # UUID part should match part_id
-            assert part_id in filename
+        # Path should be in the uploads directory
+        assert os.path.dirname(stored_path) == str(tmp_path)
+        # Filename should be UUID + extension
+        filename = os.path.basename(stored_path)
+        assert filename.endswith(".step")
+        # UUID part should match part_id
+        assert part_id in filename
 
-    def test_store_upload_multiple_files(self):
+    def test_store_upload_multiple_files(self, tmp_path):
         """Test that multiple uploads create different files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes1 = b"first file"
-            file_bytes2 = b"second file"
-
-            part_id1, stored_path1 = store_upload(file_bytes1, "file1.step", tmpdir)
-            part_id2, stored_path2 = store_upload(file_bytes2, "file2.step", tmpdir)
-
-            # Different UUIDs
-            assert part_id1 != part_id2
-            # Different paths
-            assert stored_path1 != stored_path2
-            # Both files exist
-            assert os.path.exists(stored_path1)
-            assert os.path.exists(stored_path2)
-
-            # Correct content
-            with open(stored_path1, "rb") as f:
-                assert f.read() == file_bytes1
-            with open(stored_path2, "rb") as f:
-                assert f.read() == file_bytes2
-
-    def test_store_upload_large_file(self):
+        file_bytes1 = b"first file"
+        file_bytes2 = b"second file"
+
+        part_id1, stored_path1 = store_upload(file_bytes1, "file1.step", str(tmp_path))
+        part_id2, stored_path2 = store_upload(file_bytes2, "file2.step", str(tmp_path))
+
+        # Different UUIDs
+        assert part_id1 != part_id2
+        # Different paths
+        assert stored_path1 != stored_path2
+        # Both files exist
+        assert os.path.exists(stored_path1)
+        assert os.path.exists(stored_path2)
+
+        # Correct content
+        _assert_file_contents(stored_path1, file_bytes1)
+        _assert_file_contents(stored_path2, file_bytes2)
+
+    def test_store_upload_large_file(self, tmp_path):
         """Test that store_upload handles larger files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a 1MB file
-            file_bytes = b"X" * (1024 * 1024)
-            original_filename = "large.step"
+        # Create a 1MB file
+        file_bytes = b"X" * (1024 * 1024)
+        original_filename = "large.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # File should exist and have correct size
-            assert os.path.exists(stored_path)
-            assert os.path.getsize(stored_path) == len(file_bytes)
+        # File should exist and have correct size
+        assert os.path.exists(stored_path)
+        assert os.path.getsize(stored_path) == len(file_bytes)
 
-            # Verify content
-            with open(stored_path, "rb") as f:
-                assert f.read() == file_bytes
+        # Verify content without a second 1MB copy
+        _assert_file_contents(stored_path, file_bytes)
 
-    def test_store_upload_empty_file(self):
+    def test_store_upload_empty_file(self, tmp_path):
         """Test that store_upload handles empty files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b""
-            original_filename = "empty.step"
+        file_bytes = b""
+        original_filename = "empty.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # File should exist
-            assert os.path.exists(stored_path)
-            # File should be empty
-            assert os.path.getsize(stored_path) == 0
+        # File should exist
+        assert os.path.exists(stored_path)
+        # File should be empty
+        assert os.path.getsize(stored_path) == 0
 
-    def test_store_upload_binary_content(self):
+    def test_store_upload_binary_content(self, tmp_path):
         """Test that store_upload handles binary content correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Binary content with null bytes and various values
-            file_bytes = bytes(range(256))
-            original_filename = "binary.step"
+        # Binary content with null bytes and various values
+        file_bytes = _BINARY_256
+        original_filename = "binary.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            # Verify exact binary content
-            with open(stored_path, "rb") as f:
-                stored_bytes = f.read()
+        # Verify exact binary content
+        _assert_file_contents(stored_path, file_bytes)
 
-            assert stored_bytes == file_bytes
-
-    def test_store_upload_filename_format(self):
+    def test_store_upload_filename_format(self, tmp_path):
         """Test that stored filename follows UUID.extension format."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_bytes = b"test"
-            original_filename = "my_part.step"
+        file_bytes = b"test"
+        original_filename = "my_part.step"
 
-            part_id, stored_path = store_upload(file_bytes, original_filename, tmpdir)
+        part_id, stored_path = store_upload(file_bytes, original_filename, str(tmp_path))
 
-            filename = os.path.basename(stored_path)
-            # Should be <uuid>.step format
-            name, ext = os.path.splitext(filename)
+        filename = os.path.basename(stored_path)
+        # Should be <uuid>.step format
+        name, ext = os.path.splitext(filename)
 
-            # Name part should be valid UUID
-            uuid_obj = uuid.UUID(name)
-            assert str(uuid_obj) == name
-            # Extension should match
-            assert ext == ".step"
+        # Name part should be valid UUID
+        uuid_obj = uuid.UUID(name)
+        assert str(uuid_obj) == name
+        # Extension should match
+        assert ext == ".step"
 
 
 class TestValidateStepGeometry:
@@ -7,7 +7,7 @@ Tests PDF generation from processing results.
 import os
 import pytest
 from io import BytesIO
-from PyPDF2 import PdfReader
+from pypdf import PdfReader
 import cadquery as cq
 
 from modules.pdf_generator import generate_quote_pdf
@@ -187,35 +187,31 @@ class TestPdfGeneration:
         assert len(reader.pages) > 0
 
 
+@pytest.fixture(scope="module")
+def minimal_pdf_text():
+    """Text of the PDF for the minimal processing result (generated once)."""
+    pdf_bytes = generate_quote_pdf(_create_minimal_processing_result())
+    return _extract_text_from_pdf(pdf_bytes)
+
+
 class TestPdfContentSections:
     """Test that all required sections are present in PDF."""
 
-    def test_pdf_contains_specifications_section(self):
+    def test_pdf_contains_specifications_section(self, minimal_pdf_text):
         """PDF should have specifications section."""
-        result = _create_minimal_processing_result()
-
-        pdf_bytes = generate_quote_pdf(result)
-        pdf_text = _extract_text_from_pdf(pdf_bytes)
+        pdf_text = minimal_pdf_text
 
         assert "Specifications" in pdf_text
         assert "Material:" in pdf_text or "Aluminum" in pdf_text
         assert "Finish:" in pdf_text or "As-machined" in pdf_text
 
-    def test_pdf_contains_quote_date(self):
+    def test_pdf_contains_quote_date(self, minimal_pdf_text):
         """PDF should include quote date."""
-        result = _create_minimal_processing_result()
-
-        pdf_bytes = generate_quote_pdf(result)
-        pdf_text = _extract_text_from_pdf(pdf_bytes)
-
-        assert "Quote Date:" in pdf_text
+        assert "Quote Date:" in minimal_pdf_text
 
-    def test_pdf_contains_disclaimer(self):
+    def test_pdf_contains_disclaimer(self, minimal_pdf_text):
         """PDF should have disclaimer text."""
-        result = _create_minimal_processing_result()
-
-        pdf_bytes = generate_quote_pdf(result)
-        pdf_text = _extract_text_from_pdf(pdf_bytes)
+        pdf_text = minimal_pdf_text
 
         assert "Disclaimer" in pdf_text or "automatically generated" in pdf_text.lower()
 
@@ -656,9 +652,4 @@ def _extract_text_from_pdf(pdf_bytes: bytes) -> str:
         Extracted text as string
     """
     reader = PdfReader(BytesIO(pdf_bytes))
-    text = ""
-
-    for page in reader.pages:
-        text += page.extract_text()
-
-    return text
+    return "".join(page.extract_text() for page in reader.pages)